@@ -1,6 +1,7 @@
 import base64
 import datetime
 import json
+import os
 import re
 import shutil
 import subprocess
@@ -10,6 +11,8 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Optional, Tuple, Union, List
 
+from CMC_Http import HAVE_REQUESTS, SESSION
+
 # ------------------------------------------------------------
 # CMC_Git.py — Git + GitHub module for Computer Main Centre
 #
@@ -18,7 +21,7 @@ from typing import Callable, Optional, Tuple, Union, List
 #   git update [owner/repo|url|repoName] ["commit msg"] [--add <path>]
 #   git link <owner/repo|url>
 #   git open
-#   git download <owner/repo|url>
+#   git download <owner/repo|url> [full]
 #   git repo list [all|mine]
 #   git repo delete <owner/repo|repoName>
 #   git doctor
@@ -41,7 +44,6 @@ from typing import Callable, Optional, Tuple, Union, List
 PFunc = Callable[[str], None]
 
 GIT_CFG = Path.home() / ".ai_helper" / "github.json"
-GIT_CFG.parent.mkdir(parents=True, exist_ok=True)
 
 AUTH_ERR_MARKERS = (
     "authentication failed",
@@ -53,6 +55,8 @@ AUTH_ERR_MARKERS = (
     "repository not found",
     "access denied",
 )
+# Single alternation so auth checks are one regex pass over the output.
+_AUTH_ERR_RE = re.compile("|".join(re.escape(m) for m in AUTH_ERR_MARKERS))
 
 # Default ignore patterns for CMC Git (general-purpose + safe defaults)
 # NOTE: We intentionally do NOT ignore *.exe / *.dll / *.mp4 / *.zip etc.
@@ -170,6 +174,8 @@ def _cfg_load() -> dict:
 
 def _cfg_save(data: dict) -> None:
     try:
+        # Created on first write, not at import: most sessions never touch git.
+        GIT_CFG.parent.mkdir(parents=True, exist_ok=True)
         GIT_CFG.write_text(json.dumps(data, indent=2), encoding="utf-8")
     except Exception:
         pass
@@ -302,8 +308,15 @@ def _git_installed() -> bool:
     return bool(shutil.which("git"))
 
 def _looks_like_auth_error(out: str) -> bool:
-    o = (out or "").lower()
-    return any(m in o for m in AUTH_ERR_MARKERS)
+    return bool(_AUTH_ERR_RE.search((out or "").lower()))
+
+def _push_auth_failed(rc: int, out: str) -> bool:
+    """
+    Retry-without-identity decision for git push. Auth failures exit 128;
+    rejected refs exit 1 and would fail again, so the text match alone is
+    not enough to justify a second push.
+    """
+    return rc == 128 and _looks_like_auth_error(out)
 
 def _git_run(args: List[str], cwd: Union[str, Path], identity: Optional[GitIdentity] = None) -> Tuple[int, str]:
     """
@@ -321,7 +334,7 @@ def _git_run(args: List[str], cwd: Union[str, Path], identity: Optional[GitIdent
     cmd += args
 
     try:
-        r = subprocess.run(cmd, cwd=str(cwd), text=True, capture_output=True)
+        r = subprocess.run(cmd, cwd=cwd, text=True, capture_output=True)
         out = (r.stdout or "").strip()
         err = (r.stderr or "").strip()
         combined = (out + ("\n" + err if err else "")).strip()
@@ -348,19 +361,28 @@ def _get_origin_remote(root: Path) -> str:
     return ""
 
 def _set_origin_remote(root: Path, remote_url: str) -> None:
-    rc, _ = _git_run(["remote", "get-url", "origin"], cwd=root)
-    if rc == 0:
-        _git_run(["remote", "set-url", "origin", remote_url], cwd=root)
-    else:
+    # Usually origin already exists: try set-url first, add only if that fails.
+    rc, _ = _git_run(["remote", "set-url", "origin", remote_url], cwd=root)
+    if rc != 0:
         _git_run(["remote", "add", "origin", remote_url], cwd=root)
 
 def _has_commits(root: Path) -> bool:
     rc, _ = _git_run(["rev-parse", "--verify", "HEAD"], cwd=root)
     return rc == 0
 
-def _status_porcelain(root: Path) -> str:
-    _, out = _git_run(["status", "--porcelain"], cwd=root)
-    return out.strip()
+def _git_state(root: Path) -> Tuple[bool, bool]:
+    """
+    (has_commits, dirty) from a single `git status --porcelain=v2 --branch`.
+    Header lines start with '#'; '# branch.oid (initial)' means no commits yet.
+    If status fails, report (False, True) so callers fall through to git itself.
+    """
+    rc, out = _git_run(["status", "--porcelain=v2", "--branch"], cwd=root)
+    if rc != 0:
+        return False, True
+    lines = out.splitlines()
+    has_commits = "# branch.oid (initial)" not in lines
+    dirty = any(line and not line.startswith("#") for line in lines)
+    return has_commits, dirty
 
 def _gitignore_add(root: Path, patterns: List[str]) -> None:
     gi = root / ".gitignore"
@@ -406,22 +428,29 @@ def _gitignore_add(root: Path, patterns: List[str]) -> None:
 def _warn_big_files(root: Path, limit_mb: int = 100) -> List[str]:
     limit = limit_mb * 1024 * 1024
     big: List[str] = []
-    try:
-        for fp in root.rglob("*"):
-            if ".git" in fp.parts:
-                continue
-            if fp.is_file() and fp.stat().st_size > limit:
-                big.append(str(fp.relative_to(root)))
-    except Exception:
-        pass
+    # Plain-string scandir walk: DirEntry caches the file type, and we only
+    # build a relative path for the (rare) hits.
+    root_s = os.fspath(root)
+    stack = [root_s]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name != ".git":
+                                stack.append(entry.path)
+                        elif entry.is_file() and entry.stat().st_size > limit:
+                            big.append(os.path.relpath(entry.path, root_s))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
     return big
 
 def _ensure_readme_if_empty(root: Path) -> None:
-    if _has_commits(root):
-        return
-
-    _git_run(["add", "-A"], cwd=root)
-    if _status_porcelain(root):
+    has_commits, dirty = _git_state(root)
+    if has_commits or dirty:
         return
 
     readme = root / "README.md"
@@ -447,6 +476,11 @@ def _ensure_branch(root: Path, branch: str) -> Tuple[int, str]:
     return rc3, out3
 
 def _commit_if_needed(root: Path, msg: str) -> str:
+    # Clean tree on an existing history: skip the full-tree "add -A" scan.
+    has_commits, dirty = _git_state(root)
+    if has_commits and not dirty:
+        return "ℹ️ Nothing to commit."
+
     _git_run(["add", "-A"], cwd=root)
     rc, out = _git_run(["commit", "-m", msg], cwd=root)
     if rc != 0 and "nothing to commit" in out.lower():
@@ -485,26 +519,28 @@ def _push(root: Path, identity: Optional[GitIdentity]) -> Tuple[int, str]:
     if _looks_like_placeholder_remote(remote):
         return 128, "Origin remote contains placeholder '<you>'. Fix origin to a real repo (git link owner/repo)."
 
+    # --porcelain prints one machine-readable status line per ref (stdout).
+    args = ["push", "--porcelain", "--no-progress"]
     if identity and remote and _is_github_remote(remote) and remote.startswith("https://"):
-        rc, out = _git_run(["push"], cwd=root, identity=identity)
+        rc, out = _git_run(args, cwd=root, identity=identity)
         if rc == 0:
             return rc, out
-        if _looks_like_auth_error(out):
-            return _git_run(["push"], cwd=root, identity=None)
+        if _push_auth_failed(rc, out):
+            return _git_run(args, cwd=root, identity=None)
         return rc, out
-    return _git_run(["push"], cwd=root, identity=None)
+    return _git_run(args, cwd=root, identity=None)
 
 def _push_branch(root: Path, branch: str, identity: Optional[GitIdentity]) -> Tuple[int, str]:
     remote = _get_origin_remote(root)
     if _looks_like_placeholder_remote(remote):
         return 128, "Origin remote contains placeholder '<you>'. Fix origin to a real repo (git link owner/repo)."
 
-    args = ["push", "--set-upstream", "origin", branch]
+    args = ["push", "--porcelain", "--no-progress", "--set-upstream", "origin", branch]
     if identity and remote and _is_github_remote(remote) and remote.startswith("https://"):
         rc, out = _git_run(args, cwd=root, identity=identity)
         if rc == 0:
             return rc, out
-        if _looks_like_auth_error(out):
+        if _push_auth_failed(rc, out):
             return _git_run(args, cwd=root, identity=None)
         return rc, out
     return _git_run(args, cwd=root, identity=None)
@@ -529,12 +565,12 @@ def _push_force_with_lease(root: Path, branch: str, identity: Optional[GitIdenti
     if _looks_like_placeholder_remote(remote):
         return 128, "Origin remote contains placeholder '<you>'. Fix origin to a real repo (git link owner/repo)."
 
-    args = ["push", "--force-with-lease", "origin", branch]
+    args = ["push", "--porcelain", "--no-progress", "--force-with-lease", "origin", branch]
     if identity and remote and _is_github_remote(remote) and remote.startswith("https://"):
         rc, out = _git_run(args, cwd=root, identity=identity)
         if rc == 0:
             return rc, out
-        if _looks_like_auth_error(out):
+        if _push_auth_failed(rc, out):
             return _git_run(args, cwd=root, identity=None)
         return rc, out
     return _git_run(args, cwd=root, identity=None)
@@ -597,9 +633,6 @@ def _write_debug_report(root: Path, title: str, content: str) -> Optional[Path]:
 # ---------------------------
 
 def _gh_request(method: str, url: str, token: str, body: Optional[dict] = None) -> Tuple[int, str]:
-    import urllib.error
-    import urllib.request
-
     headers = {
         "User-Agent": "CMC-GitAssistant",
         "Accept": "application/vnd.github+json",
@@ -611,6 +644,17 @@ def _gh_request(method: str, url: str, token: str, body: Optional[dict] = None)
         data = json.dumps(body).encode("utf-8")
         headers["Content-Type"] = "application/json"
 
+    # Shared pooled session (keep-alive across repo-list pages and uploads)
+    if HAVE_REQUESTS:
+        try:
+            r = SESSION.request(method, url, data=data, headers=headers, timeout=25)
+            return r.status_code, r.text
+        except Exception as e:
+            return 0, str(e)
+
+    import urllib.error
+    import urllib.request
+
     req = urllib.request.Request(url, data=data, method=method, headers=headers)
     try:
         with urllib.request.urlopen(req, timeout=25) as resp:
@@ -665,6 +709,60 @@ def _gh_list_repos(token: str, affiliation: str = "owner,collaborator,organizati
         page += 1
     return repos
 
+_GH_REPOS_QUERY = """
+query($cursor: String) {
+  viewer {
+    repositories(first: 100, after: $cursor,
+                 affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      nodes { name isPrivate isFork owner { login } }
+      pageInfo { endCursor hasNextPage }
+    }
+  }
+}
+"""
+
+def _gh_list_repos_graphql(token: str) -> Optional[List[dict]]:
+    """
+    Same result shape as _gh_list_repos (name/private/fork/owner.login), but
+    fetched through GraphQL: only the needed fields, one round-trip per 100 repos.
+    Returns None if GraphQL is unavailable so the caller can fall back to REST.
+    """
+    repos: List[dict] = []
+    cursor: Optional[str] = None
+    while True:
+        code, raw = _gh_request(
+            "POST",
+            "https://api.github.com/graphql",
+            token,
+            body={"query": _GH_REPOS_QUERY, "variables": {"cursor": cursor}},
+        )
+        if code != 200:
+            return None
+        try:
+            payload = json.loads(raw)
+            conn = payload["data"]["viewer"]["repositories"]
+        except Exception:
+            return None
+        if payload.get("errors"):
+            return None
+
+        for node in conn.get("nodes") or []:
+            if not node:
+                continue
+            repos.append({
+                "name": node.get("name"),
+                "private": bool(node.get("isPrivate")),
+                "fork": bool(node.get("isFork")),
+                "owner": {"login": (node.get("owner") or {}).get("login", "")},
+            })
+
+        page = conn.get("pageInfo") or {}
+        if not page.get("hasNextPage"):
+            return repos
+        cursor = page.get("endCursor")
+
 def _gh_delete_repo(token: str, owner: str, repo: str) -> Tuple[bool, str]:
     code, raw = _gh_request("DELETE", f"https://api.github.com/repos/{owner}/{repo}", token)
     if code == 204:
@@ -1059,7 +1157,9 @@ def handle_git_commands(raw: str, low: str, cwd: Union[str, Path], p: PFunc, RIC
             p("Fix: create a GitHub PAT (classic) with repo scope (or a fine-grained token with repo access).")
             return True
 
-        repos = _gh_list_repos(ident.token)
+        repos = _gh_list_repos_graphql(ident.token)
+        if repos is None:
+            repos = _gh_list_repos(ident.token)
         if not repos:
             p("No repositories found (or token has no access).")
             return True
@@ -1111,11 +1211,11 @@ def handle_git_commands(raw: str, low: str, cwd: Union[str, Path], p: PFunc, RIC
         return True
 
     # --------------------------------------------------------
-    # git download <owner/repo|url>
+    # git download <owner/repo|url> [full]
     # --------------------------------------------------------
     if cmd in ("download", "clone"):
         if len(toks) < 3:
-            p("[red]❌ Usage:[/red] git download <owner>/<repo> (or GitHub URL)")
+            p("[red]❌ Usage:[/red] git download <owner>/<repo> [full] (or GitHub URL)")
             return True
 
         spec = toks[2].strip()
@@ -1124,16 +1224,22 @@ def handle_git_commands(raw: str, low: str, cwd: Union[str, Path], p: PFunc, RIC
             p("[red]❌ Use owner/repo format or a github.com URL.[/red]")
             return True
 
+        # Default: shallow clone of the default branch (latest snapshot only).
+        # "full" keeps the old behavior and fetches the complete history.
+        full = len(toks) >= 4 and toks[3].lower() == "full"
+
         owner, repo = parsed
         target = start / repo
-        if target.exists():
+        # An empty folder is a fine clone target; anything else git would refuse
+        if target.exists() and (not target.is_dir() or any(target.iterdir())):
             p(f"[red]❌ Folder already exists:[/red] {target}")
             return True
 
         url = f"https://github.com/{owner}/{repo}.git"
-        p(f"⬇️ Cloning {url}")
+        clone_args = ["clone", url, repo] if full else ["clone", "--depth=1", "--single-branch", url, repo]
+        p(f"⬇️ Cloning {url}" + ("" if full else " (latest snapshot; add 'full' for history)"))
 
-        rc, out = _git_run(["clone", url, repo], cwd=start)
+        rc, out = _git_run(clone_args, cwd=start)
         if rc == 0:
             p(f"📁 Installed to: {target}")
             return True
@@ -1141,7 +1247,7 @@ def handle_git_commands(raw: str, low: str, cwd: Union[str, Path], p: PFunc, RIC
         if _looks_like_auth_error(out):
             ident = _get_identity(interactive=True, p=p)
             if ident:
-                rc2, out2 = _git_run(["clone", url, repo], cwd=start, identity=ident)
+                rc2, out2 = _git_run(clone_args, cwd=start, identity=ident)
                 if rc2 == 0:
                     p(f"📁 Installed to: {target}")
                     return True
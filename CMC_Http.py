@@ -0,0 +1,33 @@
+"""
+CMC_Http.py - Shared pooled HTTP session for Computer Main Centre (CMC)
+
+One keep-alive client for every module that talks to GitHub (the updater
+and the Git assistant), so connections and TLS sessions are reused across
+the API, zipball and raw-file calls instead of one handshake per request.
+
+- HAVE_REQUESTS: True when requests (and its urllib3 pool) is installed
+- SESSION: the shared requests.Session, or None
+
+requests also applies HTTPS_PROXY / NO_PROXY. Without it, callers use
+plain urllib.request, which handles proxies the same way.
+"""
+
+from __future__ import annotations
+
+HAVE_REQUESTS = False
+SESSION = None
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    SESSION = requests.Session()
+    SESSION.mount("https://", HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        # Retry only covers idempotent methods (GET/PUT/DELETE/...), never POST
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504)),
+    ))
+    HAVE_REQUESTS = True
+except Exception:
+    pass
@@ -16,10 +16,14 @@ from Computer_Main_Centre.py.
 from __future__ import annotations
 
 import os
+import re
 import shlex
 import json
+from concurrent.futures import ThreadPoolExecutor
+from heapq import nlargest
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, Iterator, List, Tuple
 
 
 def _fmt_bytes(n: int) -> str:
@@ -35,6 +39,32 @@ def _fmt_bytes(n: int) -> str:
     return f"{x:.1f} TB"
 
 
+# Junk folder patterns as one alternation (one regex pass per path).
+# Dict order is the priority when several patterns hit the same path.
+_FOLDER_REASONS = {
+    "node_modules": "Dependency cache (node_modules)",
+    "pycache": "Python bytecode cache (__pycache__)",
+    "cache": "Tool/framework cache (.cache)",
+    "temp": "Temporary folder (Temp)",
+    "tmp": "Temporary folder (tmp)",
+    "shadercache": "Graphics / game shader cache",
+    "crashdumps": "Crash dump files",
+    "logs": "Log folder",
+}
+_FOLDER_PRIORITY = {name: i for i, name in enumerate(_FOLDER_REASONS)}
+_FOLDER_RE = re.compile(
+    r"(?P<node_modules>node_modules)"
+    r"|(?P<pycache>__pycache__)"
+    r"|(?P<cache>\.cache)"
+    r"|(?P<temp>[\\/]temp(?=[\\/]))"
+    r"|(?P<tmp>[\\/]tmp(?=[\\/]))"
+    r"|(?P<shadercache>shadercache)"
+    r"|(?P<crashdumps>crashdumps)"
+    r"|(?P<logs>[\\/]logs)"
+)
+_DOWNLOADS_RE = re.compile(r"[\\/]downloads")
+
+
 def _iter_children(root: Path) -> List[Path]:
     try:
         return list(root.iterdir())
@@ -42,38 +72,63 @@ def _iter_children(root: Path) -> List[Path]:
         return []
 
 
+# POSIX: scandir over an open directory fd makes DirEntry.stat() an fstatat()
+# relative to that fd, so the kernel does not re-resolve the full path per file.
+_SCANDIR_FD = os.scandir in os.supports_fd
+
+
+def _scan_dir(dir_path: str) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Yield (full_path, entry) for each entry of dir_path."""
+    if not _SCANDIR_FD:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                yield entry.path, entry
+        return
+
+    fd = os.open(dir_path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        prefix = os.path.join(dir_path, "")
+        with os.scandir(fd) as it:
+            entries = list(it)
+        # Hand entries out in inode order (d_ino, free from the listing) so
+        # the caller's stats walk the inode table sequentially instead of in
+        # hash order - far fewer seeks on cold caches / spinning disks.
+        entries.sort(key=os.DirEntry.inode)
+        for entry in entries:
+            yield prefix + entry.name, entry
+    finally:
+        os.close(fd)
+
+
 def _folder_size(root: Path, max_depth: int, file_accumulator: List[Tuple[str, int]]) -> int:
     """
     Compute total size of a folder up to a relative depth limit.
     Also appends (path, size) for each file into file_accumulator.
+
+    Uses os.scandir directly: DirEntry carries the entry type (and on Windows
+    the size) from the directory listing, so most files cost no extra stat.
+    On POSIX the remaining stat is fd-relative (see _scan_dir).
     """
     total = 0
     root = root.resolve()
-    try:
-        for dirpath, dirnames, filenames in os.walk(root):
-            dir_path = Path(dirpath)
-            try:
-                rel = dir_path.relative_to(root)
-                depth = len(rel.parts)
-            except Exception:
-                depth = 0
-
-            if depth > max_depth:
-                dirnames[:] = []
-                continue
-
-            for name in filenames:
-                f = dir_path / name
+    stack: List[Tuple[str, int]] = [(str(root), 0)]
+    while stack:
+        dir_path, depth = stack.pop()
+        try:
+            for path, entry in _scan_dir(dir_path):
                 try:
-                    st = f.stat()
-                    size = st.st_size
-                except Exception:
+                    if entry.is_dir(follow_symlinks=False):
+                        if depth < max_depth:
+                            stack.append((path, depth + 1))
+                        continue
+                    size = entry.stat(follow_symlinks=False).st_size
+                except OSError:
                     continue
                 total += size
-                file_accumulator.append((str(f), size))
-    except Exception:
-        # best-effort; ignore permission issues etc.
-        pass
+                file_accumulator.append((path, size))
+        except OSError:
+            # best-effort; ignore permission issues etc.
+            continue
     return total
 
 
@@ -104,35 +159,16 @@ def _detect_junk_candidates(
     root_str = str(root)
     root_lower = root_str.lower()
 
-    # Folder-based patterns
-    folder_patterns = [
-        ("node_modules", "Dependency cache (node_modules)"),
-        ("__pycache__", "Python bytecode cache (__pycache__)"),
-        (".cache", "Tool/framework cache (.cache)"),
-        ("\\temp\\", "Temporary folder (Temp)"),
-        ("/temp/", "Temporary folder (Temp)"),
-        ("\\tmp\\", "Temporary folder (tmp)"),
-        ("/tmp/", "Temporary folder (tmp)"),
-        ("shadercache", "Graphics / game shader cache"),
-        ("crashdumps", "Crash dump files"),
-        ("\\logs", "Log folder"),
-        ("/logs", "Log folder"),
-    ]
-
-    downloads_words = ["\\downloads", "/downloads"]
-
     # Examine folders
     for path, size in top_folders:
         low = path.lower()
-        for pattern, reason in folder_patterns:
-            if pattern in low:
-                add(path, size, "folder", reason)
-                break
-        else:
+        hits = [m.lastgroup for m in _FOLDER_RE.finditer(low)]
+        if hits:
+            add(path, size, "folder", _FOLDER_REASONS[min(hits, key=_FOLDER_PRIORITY.__getitem__)])
+        elif _DOWNLOADS_RE.search(low):
             # Extra rule: big folders directly under Downloads
-            if any(w in low for w in downloads_words):
-                if size > 200 * 1024 * 1024:  # > 200 MB
-                    add(path, size, "folder", "Large folder inside Downloads (often safe to review/remove)")
+            if size > 200 * 1024 * 1024:  # > 200 MB
+                add(path, size, "folder", "Large folder inside Downloads (often safe to review/remove)")
 
     # File-based patterns
     archive_exts = {".zip", ".7z", ".rar", ".tar", ".gz", ".bz2", ".xz", ".iso", ".img"}
@@ -140,10 +176,10 @@ def _detect_junk_candidates(
 
     for path, size in top_files:
         low = path.lower()
-        ext = Path(path).suffix.lower()
+        ext = os.path.splitext(low)[1]  # same as Path(path).suffix, without building a Path
 
         if ext in archive_exts:
-            if any(w in low for w in downloads_words):
+            if _DOWNLOADS_RE.search(low):
                 add(path, size, "file", "Large archive in Downloads (e.g. installer/archive)")
         elif ext in log_exts and size > 10 * 1024 * 1024:  # > 10 MB logs
             add(path, size, "file", "Large log file (often safe to delete)")
@@ -305,11 +341,10 @@ def op_space(command: str, cwd: Path, state: Dict[str, Any], macros: Dict[str, s
     total_bytes = 0
 
     # Only measure immediate children of target for "Top folders"
+    child_dirs: List[Path] = []
     for child in _iter_children(target):
         if child.is_dir():
-            size = _folder_size(child, max_depth=depth - 1, file_accumulator=file_acc)
-            folder_sizes.append((str(child), size))
-            total_bytes += size
+            child_dirs.append(child)
         elif child.is_file():
             try:
                 sz = child.stat().st_size
@@ -318,12 +353,22 @@ def op_space(command: str, cwd: Path, state: Dict[str, Any], macros: Dict[str, s
             file_acc.append((str(child), sz))
             total_bytes += sz
 
-    # Sort and trim
-    folder_sizes.sort(key=lambda x: x[1], reverse=True)
-    file_acc.sort(key=lambda x: x[1], reverse=True)
-
-    top_folders = folder_sizes[:10]
-    top_files = file_acc[:10]
+    # Subtrees are independent and the walk is syscall-bound (GIL released),
+    # so size them in parallel; each worker fills its own file list.
+    def _measure(child: Path) -> Tuple[str, int, List[Tuple[str, int]]]:
+        acc: List[Tuple[str, int]] = []
+        return str(child), _folder_size(child, max_depth=depth - 1, file_accumulator=acc), acc
+
+    if child_dirs:
+        with ThreadPoolExecutor(max_workers=min(8, len(child_dirs))) as pool:
+            for path, size, acc in pool.map(_measure, child_dirs):
+                folder_sizes.append((path, size))
+                file_acc.extend(acc)
+                total_bytes += size
+
+    # Keep the 10 largest (heap select, O(N log 10); no full sort of every file)
+    top_folders = nlargest(10, folder_sizes, key=itemgetter(1))
+    top_files = nlargest(10, file_acc, key=itemgetter(1))
 
     # Detect junk candidates
     junk_candidates = _detect_junk_candidates(target, top_folders, top_files)
@@ -4,44 +4,160 @@ import os
 import shutil
 import tempfile
 import zipfile
-import datetime
+import zlib
+import contextlib
+import fnmatch
+import functools
+import hashlib
+import io
+import queue
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.error import HTTPError
+from urllib.parse import quote
 from urllib.request import Request, urlopen
 import subprocess
+import threading
+import time
+
+# Optional: libgit2 bindings let the git update path skip spawning git
+HAVE_PYGIT2 = False
+try:
+    import pygit2
+    HAVE_PYGIT2 = True
+except Exception:
+    pass
+
+# Optional pooled keep-alive session (requests/urllib3), shared with CMC_Git;
+# without it every call goes through plain urllib
+from CMC_Http import HAVE_REQUESTS, SESSION as _SESSION
 
 # Change this if your “official update source” repo changes
 DEFAULT_REPO = "Wiglol/Computer-Main-Centre-Public"
 DEFAULT_BRANCH = "main"
+LATEST_TTL = 60  # seconds a looked-up branch SHA is trusted without asking again
 
 DATA_DIR = Path.home() / ".ai_helper"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 STATE_FILE = DATA_DIR / "cmc_update.json"
+SPOOL_MAX = 64 * 1024 * 1024  # zipballs up to this size never touch the disk
+COMPARE_MAX_FILES = 200  # bigger diffs than this just take the zipball
+BACKUP_STREAM_MIN = 4 * 1024 * 1024  # bigger files are streamed, not buffered whole
+BACKUP_QUEUE = 16  # read-ahead files: at most ~64 MiB held in memory
+RESUME_TRIES = 3  # Range-resumes of a dropped download before giving up
 
 # These are "local junk / generated" files we should NOT overwrite during update
-SKIP_NAMES = {
+SKIP_NAMES = frozenset({
     ".ai_helper",
     ".git",
     "__pycache__",
     "CentreIndex",         # your index db lives here in some builds
-}
-SKIP_FILES = {
+})
+SKIP_FILES = frozenset({
     "paths.db",
-}
+})
 SKIP_GLOBS = [
     "centre_index*.json",
     "*.log",
     "*.tmp",
 ]
+# One compiled matcher for all globs (fnmatch is case-insensitive on Windows)
+_SKIP_GLOB_MATCH = re.compile(
+    "|".join(fnmatch.translate(g) for g in SKIP_GLOBS),
+    re.IGNORECASE if os.name == "nt" else 0,
+).match
+
+@contextlib.contextmanager
+def _http_get(url: str, headers: dict | None = None, timeout: float = 20):
+    """
+    GETs `url` and yields (status, headers, body file). Goes through the
+    shared keep-alive session when requests is installed, plain urllib
+    otherwise. Error statuses raise, except 304 Not Modified.
+    """
+    hdrs = {"User-Agent": "CMC-Updater", **(headers or {})}
+    if HAVE_REQUESTS:
+        with _SESSION.get(url, headers=hdrs, timeout=timeout, stream=True) as r:
+            if r.status_code != 304:
+                r.raise_for_status()
+            r.raw.decode_content = True
+            yield r.status_code, r.headers, r.raw
+        return
+
+    try:
+        r = urlopen(Request(url, headers=hdrs), timeout=timeout)
+    except HTTPError as e:
+        if e.code != 304:
+            raise
+        r = e
+    with r:
+        yield r.getcode(), r.headers, r
 
 def _http_json(url: str) -> dict:
-    req = Request(url, headers={"User-Agent": "CMC-Updater"})
-    with urlopen(req, timeout=20) as r:
-        return json.loads(r.read().decode("utf-8", errors="replace"))
+    with _http_get(url) as (_, _, body):
+        return json.loads(body.read().decode("utf-8", errors="replace"))
 
-def _http_download(url: str, out_path: Path) -> None:
-    req = Request(url, headers={"User-Agent": "CMC-Updater"})
-    with urlopen(req, timeout=60) as r, open(out_path, "wb") as f:
-        shutil.copyfileobj(r, f)
+def _http_fetch(url: str, spill_path: Path, max_in_memory: int = SPOOL_MAX) -> bytes | Path:
+    """
+    GETs `url` into memory. Only a body bigger than `max_in_memory` is
+    spilled to `spill_path` (via .part + rename), and that path returned.
+    A connection dropped mid-body is resumed with a Range request (up to
+    RESUME_TRIES times) instead of starting over.
+    """
+    buf = bytearray()
+    f = None
+    part = spill_path.with_name(spill_path.name + ".part")
+    got = 0
+    tries = 0
+    try:
+        while True:
+            headers = {"Range": f"bytes={got}-"} if got else None
+            try:
+                with _http_get(url, headers=headers, timeout=60) as (status, hdrs, r):
+                    if got and status != 206:
+                        # server ignored the Range: take the whole body again
+                        got = 0
+                        buf.clear()
+                        if f is not None:
+                            f.seek(0)
+                            f.truncate()
+                    start = got
+                    # 1 MiB reads (the copyfileobj default is 64 KiB off Windows)
+                    while chunk := r.read(1024 * 1024):
+                        got += len(chunk)
+                        if f is not None:
+                            f.write(chunk)
+                            continue
+                        buf += chunk
+                        if len(buf) > max_in_memory:
+                            # write to .part and rename, so an interrupted
+                            # download never looks complete
+                            f = open(part, "wb")
+                            f.write(buf)
+                            buf.clear()
+                    # a dropped connection can just look like an early EOF
+                    length = hdrs.get("Content-Length")
+                    if length and length.isdigit() and got - start < int(length):
+                        raise ConnectionError(f"download cut off after {got} bytes")
+                break
+            except Exception as e:
+                code = getattr(e, "code", None) or getattr(getattr(e, "response", None), "status_code", None)
+                if got and code == 416:
+                    break  # nothing left past `got`: the body is complete
+                if code or not got or tries >= RESUME_TRIES:
+                    raise
+                tries += 1
+    except BaseException:
+        if f is not None:
+            f.close()
+            part.unlink(missing_ok=True)
+        raise
+
+    if f is None:
+        return bytes(buf)
+    f.close()
+    os.replace(part, spill_path)
+    return spill_path
 
 def _load_state() -> dict:
     try:
@@ -52,10 +168,24 @@ def _load_state() -> dict:
     return {}
 
 def _save_state(d: dict) -> None:
+    # tmp + fsync + replace: a crash mid-save keeps the previous state file
+    # instead of leaving a truncated one. mkstemp gives every writer its own
+    # tmp file, so concurrent saves can't clobber each other's
+    tmp = None
     try:
-        STATE_FILE.write_text(json.dumps(d, indent=2), encoding="utf-8")
+        STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=STATE_FILE.parent, prefix=STATE_FILE.name + ".", suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(json.dumps(d, indent=2).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, STATE_FILE)
     except Exception:
-        pass
+        if tmp:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
         
 def _write_update_notes_version(cmc_folder: Path, version: str) -> None:
     """
@@ -73,63 +203,405 @@ def _write_update_notes_version(cmc_folder: Path, version: str) -> None:
         pass
 
 
+_SHA_RE = re.compile(r"[0-9a-f]{40}")
+
+def _git_lsremote_sha(remote: str, branch: str, cwd: Path | None = None) -> str | None:
+    # One smart-HTTP round trip, and it does not count against the API quota.
+    # `remote` is a URL, or a remote name ("origin") of the clone at `cwd`.
+    try:
+        out = subprocess.run(
+            ["git", "ls-remote", remote, f"refs/heads/{branch}"],
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=20,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        ).stdout
+    except Exception:
+        return None
+    sha = out.split("\t", 1)[0].strip()
+    return sha if _SHA_RE.fullmatch(sha) else None
+
 def _latest_sha(repo: str = DEFAULT_REPO, branch: str = DEFAULT_BRANCH) -> str | None:
-    # GitHub API: latest commit on branch
+    # Repeat checks within LATEST_TTL seconds reuse the last answer offline
+    key = f"{repo}@{branch}"
+    state = _load_state()
+    recent = (state.get("latest_checked") or {}).get(key) or {}
+    if recent.get("sha") and 0 <= time.time() - recent.get("at", 0) < LATEST_TTL:
+        return recent["sha"]
+
+    sha = _fetch_latest_sha(repo, branch, state)
+    if sha:
+        state.setdefault("latest_checked", {})[key] = {"sha": sha, "at": time.time()}
+        _save_state(state)
+    return sha
+
+def _fetch_latest_sha(repo: str, branch: str, state: dict) -> str | None:
+    if _git_installed():
+        sha = _git_lsremote_sha(f"https://github.com/{repo}.git", branch)
+        if sha:
+            return sha
+
+    # GitHub API: latest commit on branch.
+    # Conditional request: a 304 for the stored ETag reuses the last SHA and
+    # does not count against the unauthenticated rate limit.
     url = f"https://api.github.com/repos/{repo}/commits/{branch}"
+    cache = state.setdefault("commit_cache", {})
+    hit = cache.get(url) or {}
+
+    headers = {}
+    if hit.get("etag") and hit.get("sha"):
+        headers["If-None-Match"] = hit["etag"]
     try:
-        data = _http_json(url)
-        sha = (data or {}).get("sha")
-        return sha if isinstance(sha, str) and sha else None
+        with _http_get(url, headers=headers) as (status, hdrs, body):
+            if status == 304:
+                return hit["sha"]
+            data = json.loads(body.read().decode("utf-8", errors="replace"))
+            etag = hdrs.get("ETag")
     except Exception:
         return None
 
-def _should_skip(rel: Path) -> bool:
+    sha = (data or {}).get("sha")
+    if not (isinstance(sha, str) and sha):
+        return None
+    if etag:
+        cache[url] = {"etag": etag, "sha": sha}
+    return sha
+
+@functools.lru_cache(maxsize=None)
+def _should_skip(rel: str) -> bool:
+    # rel is a posix-style path relative to the CMC folder; only its first
+    # and last components matter, so it is never split in full.
+
     # top-level skip folders
-    parts = rel.parts
-    if parts and parts[0] in SKIP_NAMES:
+    if rel.partition("/")[0] in SKIP_NAMES:
         return True
 
-    name = rel.name
+    name = rel.rpartition("/")[2]
     if name in SKIP_FILES:
         return True
 
     # glob checks
-    from fnmatch import fnmatch
-    s = str(rel).replace("\\", "/")
-    for g in SKIP_GLOBS:
-        if fnmatch(name, g) or fnmatch(s, g):
-            return True
-
-    return False
+    return bool(_SKIP_GLOB_MATCH(name) or _SKIP_GLOB_MATCH(rel))
 
-def _backup_folder(src: Path) -> Path:
-    ts = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+def _enumerate(root: Path):
+    """
+    Yields (rel, DirEntry) for files _should_skip() keeps, rel being a posix
+    path relative to root. Skipped top-level folders (.git, __pycache__, ...)
+    are never descended.
+    """
+    # scandir hands back the entry type with the listing, so no extra stat
+    # per entry; rel paths are built by string concat, not Path objects.
+    stack = [(str(root), "")]
+    while stack:
+        path, prefix = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                rel = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if prefix or entry.name not in SKIP_NAMES:
+                        stack.append((entry.path, rel + "/"))
+                elif entry.is_file() and not _should_skip(rel):
+                    yield rel, entry
+
+def _backup_folder(src: Path, level: int = 1, entries=None) -> Path:
+    """
+    Zips `src` next to itself. The backup is a safety net that is rarely
+    opened, so it defaults to the fastest DEFLATE level (a few % bigger
+    than level 6); CMC_BACKUP_FAST=1 stores files uncompressed instead.
+    `entries` reuses an existing _enumerate(src) listing.
+    """
+    ts = time.strftime("%Y-%m-%d_%H-%M-%S")
     out = src.parent / f"CMC_backup_{ts}.zip"
-    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
-        for p in src.rglob("*"):
-            if p.is_dir():
-                continue
-            rel = p.relative_to(src)
-            if _should_skip(rel):
-                continue
-            zf.write(p, arcname=str(rel).replace("\\", "/"))
+    if os.environ.get("CMC_BACKUP_FAST") == "1":
+        method, level = zipfile.ZIP_STORED, None
+    else:
+        method = zipfile.ZIP_DEFLATED
+    # build as .zip.part and rename once closed: a killed backup leaves no
+    # half-written zip behind that looks like a real one
+    part = out.with_name(out.name + ".part")
+
+    # A reader thread loads the next files while this one deflates, so disk
+    # reads overlap compression (ZipFile itself stays single-threaded).
+    q = queue.Queue(maxsize=BACKUP_QUEUE)
+    stop = threading.Event()
+    reader = threading.Thread(
+        target=_backup_reader,
+        args=(src, entries if entries is not None else _enumerate(src), q, stop),
+        daemon=True,
+    )
+    reader.start()
+    try:
+        with zipfile.ZipFile(part, "w", method, compresslevel=level) as zf:
+            get, write, writestr = q.get, zf.write, zf.writestr  # hot loop locals
+            while (item := get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                info, data = item
+                if data is None:
+                    write(src / info.filename, arcname=info.filename)
+                else:
+                    info.compress_type = method
+                    writestr(info, data, compresslevel=level)
+        os.replace(part, out)
+    except BaseException:
+        stop.set()
+        part.unlink(missing_ok=True)
+        raise
     return out
 
-def _copy_tree(src_root: Path, dst_root: Path) -> None:
-    for p in src_root.rglob("*"):
-        rel = p.relative_to(src_root)
-        if _should_skip(rel):
-            continue
+def _backup_reader(src: Path, entries, q: queue.Queue, stop: threading.Event) -> None:
+    # Producer for _backup_folder: (ZipInfo, bytes) per file, then None.
+    # Files over BACKUP_STREAM_MIN come as (ZipInfo, None) and are streamed
+    # by the writer instead of being held in memory.
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                return True
+            except queue.Full:
+                pass
+        return False
 
-        dst = dst_root / rel
-        if p.is_dir():
-            dst.mkdir(parents=True, exist_ok=True)
-        else:
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(p, dst)
-            
-            
+    try:
+        for rel, _ in entries:
+            path = src / rel
+            info = zipfile.ZipInfo.from_file(path, rel)
+            data = None if info.file_size > BACKUP_STREAM_MIN else path.read_bytes()
+            if not _put((info, data)):
+                return
+    except BaseException as e:
+        _put(e)
+        return
+    _put(None)
+
+def _zip_opener(source: bytes | Path):
+    # One ZipFile per caller/thread; for in-memory zips BytesIO shares the
+    # bytes object, so each handle costs no copy
+    def _open() -> zipfile.ZipFile:
+        if isinstance(source, bytes):
+            return zipfile.ZipFile(io.BytesIO(source), "r")
+        return zipfile.ZipFile(source, "r")
+    return _open
+
+def _zip_members(source: bytes | Path) -> dict:
+    """
+    {rel: ZipInfo} for the files of a GitHub zipball that _should_skip()
+    keeps, rel being the posix path under its single repo-sha/ folder.
+    Unsafe names (absolute, .., drive letters) are dropped.
+    """
+    members = {}
+    with _zip_opener(source)() as zf:
+        for m in zf.infolist():
+            if m.is_dir() or "/" not in m.filename:
+                continue
+            rel = m.filename.split("/", 1)[1]
+            if _safe_rel(rel) and not _should_skip(rel):
+                members[rel] = m
+    return members
+
+def _safe_rel(rel: str) -> bool:
+    # a plain relative posix path: no absolute parts, .., or drive letters
+    return not any(x in ("", ".", "..") or ":" in x or "\\" in x for x in rel.split("/"))
+
+def _zip_hashes(source: bytes | Path, members: dict, jobs: int | None = None) -> dict:
+    # {rel: sha1} of the zip contents, inflated in memory on several threads
+    open_zip = _zip_opener(source)
+    items = list(members.items())
+    n = max(1, min(jobs or os.cpu_count() or 4, len(items)))
+
+    def _worker(chunk) -> list:
+        with open_zip() as zf:
+            return [(rel, hashlib.sha1(zf.read(m)).hexdigest()) for rel, m in chunk]
+
+    hashes = {}
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        for part in pool.map(_worker, [items[i::n] for i in range(n)]):
+            hashes.update(part)
+    return hashes
+
+def _extract_tree(
+    source: bytes | Path,
+    members: dict,
+    dst_root: Path,
+    jobs: int | None = None,
+    dst_entries: dict | None = None,
+    manifest: dict | None = None,
+    src_hashes: dict | None = None,
+) -> dict | None:
+    """
+    Writes zip `members` ({rel: ZipInfo}) straight into `dst_root`, with
+    no intermediate unzipped tree. Files are inflated on several threads
+    (zlib releases the GIL), each worker reading its own ZipFile handle.
+
+    dst_entries ({rel: DirEntry} from _enumerate(dst_root)) saves
+    re-statting targets the caller already listed. With a manifest
+    ({rel: [size, mtime, sha1]} from the last update) and src_hashes,
+    files are compared by content and the new manifest is returned.
+    """
+    # Create each target folder once up front, so workers never race on
+    # mkdir; shallowest first, so parents=True never has to walk back up.
+    dirs = {(dst_root / rel).parent for rel in members}
+    dirs.discard(dst_root)
+    for d in sorted(dirs, key=lambda d: len(d.parts)):
+        d.mkdir(parents=True, exist_ok=True)
+
+    open_zip = _zip_opener(source)
+    items = list(members.items())
+    n = max(1, min(jobs or os.cpu_count() or 4, len(items)))
+
+    def _worker(chunk) -> list:
+        out = []
+        with open_zip() as zf:
+            for rel, m in chunk:
+                dst = dst_root / rel
+                if dst_entries is None:
+                    dst_entry, present = None, True
+                else:
+                    dst_entry = dst_entries.get(rel)
+                    present = dst_entry is not None
+                if manifest is not None:
+                    known = manifest.get(rel) if present else None
+                    out.append((rel, _write_by_hash(zf, m, dst, dst_entry, known, src_hashes[rel])))
+                elif not (present and _member_current(m, dst, dst_entry)):
+                    _write_member(zf, m, dst)
+        return out
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        for part in pool.map(_worker, [items[i::n] for i in range(n)]):
+            results.update(part)
+    return results if manifest is not None else None
+
+def _member_current(m: zipfile.ZipInfo, dst: Path, dst_entry: os.DirEntry | None) -> bool:
+    # Same size and same CRC-32 as the zip member: the installed file
+    # already has this content, so reading it spares the rewrite. (The
+    # zipball stamps every member with the commit time, so mtimes can't
+    # tell unchanged files apart.)
+    try:
+        d = dst_entry.stat() if dst_entry is not None else dst.stat()
+        if d.st_size != m.file_size:
+            return False
+        crc = 0
+        with open(dst, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                crc = zlib.crc32(chunk, crc)
+    except OSError:
+        return False
+    return crc == m.CRC
+
+def _write_member(zf: zipfile.ZipFile, m: zipfile.ZipInfo, dst: Path) -> None:
+    with _staged(dst) as tmp:
+        with zf.open(m) as fsrc, open(tmp, "wb") as fdst:
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+        mode = (m.external_attr >> 16) & 0o777
+        if mode:
+            os.chmod(tmp, mode)
+
+@contextlib.contextmanager
+def _staged(dst: Path):
+    """
+    Yields a sibling temp path to write `dst` into; on success it replaces
+    `dst` in one os.replace, so a killed update never leaves a half-written
+    file behind (each file is either the old or the new version).
+    """
+    tmp = dst.with_name(dst.name + ".cmc_new")
+    try:
+        yield tmp
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+def _known_intact(known, dst: Path, dst_entry: os.DirEntry | None = None) -> bool:
+    """True while `dst` still has the size/mtime the manifest recorded for it."""
+    try:
+        d = dst_entry.stat() if dst_entry is not None else dst.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+    return [d.st_size, int(d.st_mtime)] == list(known[:2])
+
+def _write_by_hash(
+    zf: zipfile.ZipFile,
+    m: zipfile.ZipInfo,
+    dst: Path,
+    dst_entry: os.DirEntry | None,
+    known,
+    digest: str,
+) -> list:
+    # Zipball files all carry the new commit's mtime, so compare content
+    # instead; the target is trusted untouched while its size/mtime still
+    # match what the last update wrote.
+    if known and known[2] == digest and _known_intact(known, dst, dst_entry):
+        return known
+    _write_member(zf, m, dst)
+    d = dst.stat()
+    return [d.st_size, int(d.st_mtime), digest]
+
+
+def _changed_files(repo: str, base: str, head: str) -> list | None:
+    """
+    Files that differ between two commits (GitHub compare API), or None
+    when head is not a plain fast-forward of base or the list is truncated.
+    """
+    data = _http_json(f"https://api.github.com/repos/{repo}/compare/{base}...{head}")
+    files = (data or {}).get("files")
+    if data.get("status") != "ahead" or not isinstance(files, list):
+        return None
+    if len(files) >= 300:  # the API stops listing files at 300
+        return None
+    return files
+
+def _apply_changed_files(
+    repo: str,
+    head: str,
+    files: list,
+    cmc_folder: Path,
+    jobs: int | None = None,
+) -> list[str]:
+    """
+    Applies a compare-API file list to `cmc_folder`: added/modified files are
+    fetched from raw.githubusercontent.com at `head`, removed ones deleted.
+    Everything is downloaded before anything is written. Returns the rel
+    paths touched.
+    """
+    fetch, remove = [], []
+    for f in files:
+        name, status = f.get("filename") or "", f.get("status")
+        if status == "renamed" and f.get("previous_filename"):
+            remove.append(f["previous_filename"])
+        (remove if status == "removed" else fetch).append(name)
+    fetch = [rel for rel in fetch if _safe_rel(rel) and not _should_skip(rel)]
+    remove = [rel for rel in remove if _safe_rel(rel) and not _should_skip(rel)]
+
+    def _get(rel: str) -> tuple[str, bytes]:
+        url = f"https://raw.githubusercontent.com/{repo}/{head}/{quote(rel)}"
+        with _http_get(url, timeout=60) as (_, _, body):
+            return rel, body.read()
+
+    blobs = []
+    if fetch:
+        with ThreadPoolExecutor(max_workers=jobs or min(8, len(fetch))) as pool:
+            blobs = list(pool.map(_get, fetch))
+
+    for rel, data in blobs:
+        dst = cmc_folder / rel
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        with _staged(dst) as tmp:
+            tmp.write_bytes(data)
+    for rel in remove:
+        (cmc_folder / rel).unlink(missing_ok=True)
+    return fetch + remove
+
+
+@functools.lru_cache(maxsize=1)
 def _git_installed() -> bool:
+    # PATH lookup once per session
     return shutil.which("git") is not None
 
 
@@ -143,7 +615,60 @@ def _git_run(args, cwd: Path) -> str:
     ).stdout.strip()
 
 
-def _git_update(p, cmc_folder: Path) -> None:
+def _git_fetch_cmd(cmc_folder: Path, branch: str) -> list[str]:
+    # The updater only ever resets to origin/<branch>, so fetch just that
+    # branch. Stay shallow only if the clone already is, or the user opted
+    # in with "allow_shallow": true in the update state; a full clone is
+    # never truncated behind the user's back.
+    if (cmc_folder / ".git" / "shallow").exists() or _load_state().get("allow_shallow", False):
+        return ["git", "fetch", "--prune", "--depth=1", "origin", branch]
+    return ["git", "fetch", "--prune", "origin", branch]
+
+
+def _fetched_sha(cmc_folder: Path) -> str | None:
+    # First line of FETCH_HEAD: "<sha>\t\tbranch '<branch>' of <url>"
+    try:
+        with open(cmc_folder / ".git" / "FETCH_HEAD", encoding="utf-8") as f:
+            sha = f.readline().split("\t", 1)[0].strip()
+    except OSError:
+        return None
+    return sha if _SHA_RE.fullmatch(sha) else None
+
+
+def _git_gc_background(cmc_folder: Path) -> None:
+    # Fetches leave loose objects behind; let git reclaim them (with its
+    # normal prune grace period) without making the user wait
+    try:
+        subprocess.Popen(
+            ["git", "gc", "--auto"],
+            cwd=cmc_folder,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except Exception:
+        pass
+
+
+def _pygit2_fetch_reset(cmc_folder: Path, branch: str) -> str:
+    # In-process equivalent of: git fetch --all && git reset --hard origin/<branch>
+    repo = pygit2.Repository(str(cmc_folder))
+    for remote in repo.remotes:
+        remote.fetch()
+    target = repo.references[f"refs/remotes/origin/{branch}"].target
+    repo.reset(target, pygit2.GIT_RESET_HARD)
+    return str(target)
+
+
+def _apply_git(p, cmc_folder: Path, branch: str) -> str:
+    """
+    Backup, fetch, hard reset to origin/<branch> and clean of a git
+    install; returns the new HEAD SHA. Git failures raise.
+    """
+    # The fetch only writes inside .git, which the backup skips, so
+    # start it now and let it run while the working tree is zipped
+    fetch_cmd = _git_fetch_cmd(cmc_folder, branch)
+    fetch = None if HAVE_PYGIT2 else subprocess.Popen(fetch_cmd, cwd=cmc_folder)
+
     # Backup first
     try:
         backup = _backup_folder(cmc_folder)
@@ -151,25 +676,58 @@ def _git_update(p, cmc_folder: Path) -> None:
     except Exception as e:
         p(f"⚠️ Backup failed (continuing anyway): {e}")
 
-    _git_run(["fetch", "--all", "--prune"], cmc_folder)
-
-    # Hard reset to origin/main
-    _git_run(["reset", "--hard", "origin/main"], cmc_folder)
+    sha = None
+    if HAVE_PYGIT2:
+        try:
+            sha = _pygit2_fetch_reset(cmc_folder, branch)
+        except Exception:
+            sha = None  # fall back to the git CLI below
+
+    if sha is None:
+        if fetch is None:
+            fetch = subprocess.Popen(fetch_cmd, cwd=cmc_folder)
+        if fetch.wait() != 0:
+            raise subprocess.CalledProcessError(fetch.returncode, fetch_cmd)
+
+        # The fetched tip is in FETCH_HEAD: reset straight to it and
+        # skip the extra `git rev-parse HEAD` process afterwards
+        sha = _fetched_sha(cmc_folder)
+        subprocess.run(
+            ["git", "reset", "--hard", sha or f"origin/{branch}"],
+            cwd=cmc_folder,
+            check=True,
+        )
 
     # Clean untracked files (except important stuff)
-    _git_run(
-        ["clean", "-fd", "-e", ".ai_helper", "-e", "CentreIndex", "-e", "paths.db"],
-        cmc_folder,
+    subprocess.run(
+        ["git", "clean", "-fd", "-e", ".ai_helper", "-e", "CentreIndex", "-e", "paths.db"],
+        cwd=cmc_folder,
+        check=True,
     )
+    # Only once reset and clean are done, so gc never races them on the repo
+    _git_gc_background(cmc_folder)
+
+    if sha is None:
+        sha = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=cmc_folder,
+            text=True,
+        ).strip()
+    return sha
+
+
+def _git_update(p, cmc_folder: Path, branch: str = DEFAULT_BRANCH) -> None:
+    sha = _apply_git(p, cmc_folder, branch)
 
     # Record installed SHA
-    sha = _git_run(["rev-parse", "HEAD"], cmc_folder)
     state = _load_state()
     state["installed_sha"] = sha
     _save_state(state)
 
+    _write_update_notes_version(cmc_folder, sha)
+
     p("✅ Update applied via git.")
-    p("⚠️ Restart CMC to load the new code.")
+    p("⚠️ Restart CMC to load the new code (close and re-open).")
 
 
 def cmc_update_check(p, repo: str = DEFAULT_REPO, branch: str = DEFAULT_BRANCH) -> None:
@@ -199,65 +757,34 @@ def cmc_update_apply(
     cmc_folder: Path,
     repo: str = DEFAULT_REPO,
     branch: str = DEFAULT_BRANCH,
+    jobs: int | None = None,
 ) -> None:
+    """
+    Update the CMC install in `cmc_folder`: git fetch/reset when it is a clone,
+    otherwise download the branch zipball and unzip it over the install.
+    `jobs` caps the parallel unzip workers of the zip path (default: CPU count).
+    """
     cmc_folder = Path(cmc_folder).resolve()
 
     # ==========================================================
     # 1) PREFER GIT IF THIS IS A GIT REPOSITORY
     # ==========================================================
-    if shutil.which("git") and (cmc_folder / ".git").exists():
-        try:
-            # Backup first
-            try:
-                backup = _backup_folder(cmc_folder)
-                p(f"🧷 Backup created: {backup}")
-            except Exception as e:
-                p(f"⚠️ Backup failed (continuing anyway): {e}")
-
-            subprocess.run(
-                ["git", "fetch", "--all", "--prune"],
-                cwd=cmc_folder,
-                check=True,
-            )
-
-            subprocess.run(
-                ["git", "reset", "--hard", f"origin/{branch}"],
-                cwd=cmc_folder,
-                check=True,
-            )
-
-            subprocess.run(
-                [
-                    "git",
-                    "clean",
-                    "-fd",
-                    "-e",
-                    ".ai_helper",
-                    "-e",
-                    "CentreIndex",
-                    "-e",
-                    "paths.db",
-                ],
-                cwd=cmc_folder,
-                check=True,
-            )
-
-            sha = subprocess.check_output(
-                ["git", "rev-parse", "HEAD"],
-                cwd=cmc_folder,
-                text=True,
-            ).strip()
-
-            state = _load_state()
-            state["installed_sha"] = sha
-            _save_state(state)
-            
-            _write_update_notes_version(cmc_folder, sha)
-
-            p("✅ Update applied via git.")
-            p("⚠️ Restart CMC to load the new code (close and re-open).")
+    if _git_installed() and (cmc_folder / ".git").exists():
+        # Nothing to do when HEAD already is the tip of the clone's own
+        # origin and the tree is clean: skip the fetch, backup and reset.
+        # Local checkouts, resets and edits all fail this and get restored.
+        latest = _git_lsremote_sha("origin", branch, cwd=cmc_folder)
+        if (
+            latest
+            and _git_run(["rev-parse", "HEAD"], cmc_folder) == latest
+            and not _git_run(["status", "--porcelain"], cmc_folder)
+        ):
+            p("✅ Already up to date.")
             return
 
+        try:
+            _git_update(p, cmc_folder, branch)
+            return
         except Exception as e:
             p(f"❌ Git update failed: {e}")
             return
@@ -277,7 +804,40 @@ def cmc_update_apply(
         p("✅ Already up to date.")
         return
 
-    zip_url = f"https://api.github.com/repos/{repo}/zipball/{branch}"
+    # Small fast-forward: fetch only the files changed since `installed`
+    changed = None
+    if installed:
+        try:
+            changed = _changed_files(repo, str(installed), latest)
+        except Exception:
+            changed = None
+    if changed and len(changed) <= COMPARE_MAX_FILES:
+        p(f"⬇️ Fetching {len(changed)} changed file(s) from {repo} ({branch}) ...")
+        try:
+            backup = _backup_folder(cmc_folder)
+            p(f"🧷 Backup created: {backup}")
+        except Exception as e:
+            p(f"⚠️ Backup failed (continuing anyway): {e}")
+
+        try:
+            touched = _apply_changed_files(repo, latest, changed, cmc_folder, jobs=jobs)
+        except Exception as e:
+            p(f"⚠️ Incremental update failed ({e}); downloading the full zip instead.")
+        else:
+            manifest = state.get("manifest")
+            if isinstance(manifest, dict):
+                for rel in touched:
+                    manifest.pop(rel, None)
+            state["installed_sha"] = latest
+            _save_state(state)
+            _write_update_notes_version(cmc_folder, latest)
+            p("✅ Update applied.")
+            p("⚠️ Restart CMC to load the new code (close and re-open).")
+            return
+
+    # Pin the download to the SHA we record: the cached branch tip may be
+    # up to LATEST_TTL old, and the branch may have moved on since
+    zip_url = f"https://api.github.com/repos/{repo}/zipball/{latest}"
 
     p(f"⬇️ Downloading update from {repo} ({branch}) ...")
     with tempfile.TemporaryDirectory() as td:
@@ -285,44 +845,117 @@ def cmc_update_apply(
         zip_path = td / "cmc_update.zip"
 
         try:
-            _http_download(zip_url, zip_path)
+            zip_data = _http_fetch(zip_url, zip_path)
         except Exception as e:
             p(f"❌ Download failed: {e}")
             return
 
         try:
-            with zipfile.ZipFile(zip_path, "r") as zf:
-                zf.extractall(td / "unzipped")
+            members = _zip_members(zip_data)
         except Exception as e:
             p(f"❌ Unzip failed: {e}")
             return
 
-        # zipball has a single top folder like repo-commitsha/
-        unz = td / "unzipped"
-        top_dirs = [x for x in unz.iterdir() if x.is_dir()]
-        if not top_dirs:
-            p("❌ Unzip failed: no folder found inside zip.")
+        if not members:
+            p("❌ Unzip failed: no files found inside zip.")
+            return
+
+        # CMC_FAST_CHECK=1: keep a {rel: [size, mtime, sha1]} manifest so
+        # unchanged files are recognised by content even though every
+        # zipball file arrives with a new mtime
+        manifest = (state.get("manifest") or {}) if os.environ.get("CMC_FAST_CHECK") == "1" else None
+        src_hashes = None
+        if manifest is not None:
+            try:
+                src_hashes = _zip_hashes(zip_data, members, jobs=jobs)
+            except Exception as e:
+                p(f"❌ Unzip failed: {e}")
+                return
+
+        # Upstream moved, but not one of our files did, and none was deleted
+        # or edited locally since the last update: skip backup and copy
+        if (
+            manifest
+            and src_hashes == {rel: v[2] for rel, v in manifest.items()}
+            # VERSION.txt is rewritten by every update, so it never matches
+            and all(
+                _known_intact(v, cmc_folder / rel)
+                for rel, v in manifest.items()
+                if rel != "UpdateNotes/VERSION.txt"
+            )
+        ):
+            state["installed_sha"] = latest
+            _save_state(state)
+            _write_update_notes_version(cmc_folder, latest)
+            p(f"✅ Installed files already match {latest[:8]}; nothing to copy.")
             return
-        src_root = top_dirs[0]
+
+        # One listing of the install feeds both the backup and the copy
+        existing = dict(_enumerate(cmc_folder))
 
         # Backup
         try:
-            backup = _backup_folder(cmc_folder)
+            backup = _backup_folder(cmc_folder, entries=existing.items())
             p(f"🧷 Backup created: {backup}")
         except Exception as e:
             p(f"⚠️ Backup failed (continuing anyway): {e}")
 
-        # Copy over
+        # Unzip straight over the install
         try:
-            _copy_tree(src_root, cmc_folder)
+            new_manifest = _extract_tree(
+                zip_data,
+                members,
+                cmc_folder,
+                jobs=jobs,
+                dst_entries=existing,
+                manifest=manifest,
+                src_hashes=src_hashes,
+            )
         except Exception as e:
             p(f"❌ Copy failed: {e}")
             return
 
     state["installed_sha"] = latest
+    if new_manifest is not None:
+        state["manifest"] = new_manifest
     _save_state(state)
     
     _write_update_notes_version(cmc_folder, latest)
 
     p("✅ Update applied.")
     p("⚠️ Restart CMC to load the new code (close and re-open).")
+
+_BG_LOCK = threading.Lock()
+_BG_UPDATE: threading.Thread | None = None
+
+def cmc_update_apply_bg(
+    p,
+    cmc_folder: Path,
+    repo: str = DEFAULT_REPO,
+    branch: str = DEFAULT_BRANCH,
+    jobs: int | None = None,
+) -> threading.Thread:
+    """
+    Runs cmc_update_apply on a worker thread and returns it at once, so the
+    caller stays responsive; progress still goes through `p`. The thread
+    is not a daemon: exiting CMC waits for the update to finish instead of
+    cutting it off mid-write. Join the returned thread to wait.
+
+    While an update is still running, no second one is started; the
+    running thread is returned instead.
+    """
+    global _BG_UPDATE
+    with _BG_LOCK:
+        if _BG_UPDATE is not None and _BG_UPDATE.is_alive():
+            p("⚠️ An update is already running.")
+            return _BG_UPDATE
+
+        def _run() -> None:
+            try:
+                cmc_update_apply(p, cmc_folder, repo=repo, branch=branch, jobs=jobs)
+            except Exception as e:
+                p(f"❌ Update failed: {e}")
+
+        _BG_UPDATE = threading.Thread(target=_run, name="cmc-update")
+        _BG_UPDATE.start()
+        return _BG_UPDATE
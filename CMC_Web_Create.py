@@ -18,15 +18,34 @@ from __future__ import annotations
 
 import os
 import sys
+import re
 import json
+import functools
 import subprocess
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional, Union
 import shutil
 
+# Skip npm's audit/funding round-trips and reuse cached metadata
+_NPM_INSTALL_FLAGS = ("--no-audit", "--no-fund", "--prefer-offline")
+
+_TAIL_LINES = 20        # output lines shown for a successful command
+_FAIL_TAIL_LINES = 200  # ... and for a failed one
+
+
+@functools.lru_cache(maxsize=1)
 def find_npm():
-    """Return absolute path to npm executable, or None if not found."""
+    """
+    Return absolute path to npm executable, or None if not found.
+
+    CMC_NPM overrides the PATH lookup. The result is cached; call
+    find_npm.cache_clear() after changing PATH or CMC_NPM.
+    """
+    override = os.environ.get("CMC_NPM")
+    if override:
+        return override
     for cmd in ["npm.cmd", "npm.exe", "npm"]:
         found = shutil.which(cmd)
         if found:
@@ -34,6 +53,11 @@ def find_npm():
     return None
 
 
+@functools.lru_cache(maxsize=1)
+def find_uv():
+    """Return absolute path to uv (fast pip replacement), or None."""
+    return shutil.which("uv")
+
 
 # ------------------------------------------------------------
 # Small helpers
@@ -48,79 +72,141 @@ def _print_header(title: str) -> None:
     print("-" * 60)
 
 
+def _dir_nonempty(path: Path) -> bool:
+    """True if `path` has any entry (stops at the first one)."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except FileNotFoundError:
+        return False
+    except NotADirectoryError:
+        return True     # a file in the way: don't touch it either
+
+
+def _mkdirs_bulk(paths: Iterable[Path]) -> None:
+    """
+    Create a set of folders with one mkdir per leaf: a folder that is the
+    parent of another one in the set gets created along with it.
+    """
+    dirs = set(paths)
+    parents = {parent for d in dirs for parent in d.parents}
+    for d in dirs - parents:
+        d.mkdir(parents=True, exist_ok=True)
+
+
+# O_BINARY matters on Windows: without it os.write would turn \n into \r\n
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
+
+def _write_one(path: Path, data: bytes) -> None:
+    """Write a small file with raw os.open/os.write (no io buffer objects)."""
+    fd = os.open(path, _WRITE_FLAGS, 0o666)   # umask applies, as with open()
+    try:
+        view = memoryview(data)
+        while view:
+            n = os.write(fd, view[:1 << 20])
+            view = view[n:]
+    finally:
+        os.close(fd)
+
+
+def _write_files_bulk(files: Dict[Path, Union[str, bytes]]) -> None:
+    """
+    Write a batch of generated files: each parent folder is created once,
+    and content goes out as UTF-8 bytes in a single binary write.
+
+    str content gets the platform line endings, same as write_text
+    (the .bat files expect CRLF on Windows); bytes are written as-is.
+    """
+    _mkdirs_bulk(path.parent for path in files)
+    for path, data in files.items():
+        if isinstance(data, str):
+            if os.linesep != "\n":
+                data = data.replace("\n", os.linesep)
+            data = data.encode("utf-8")
+        _write_one(path, data)
+
+
+_SLUG_DROP = re.compile(r"[^\w _-]")   # punctuation etc. disappears
+_SLUG_SEP = re.compile(r"[ _-]+")      # runs of separators become one dash
+
+
 def _slugify(name: str) -> str:
     """Turn 'My App Name' into 'my-app-name'."""
-    clean = []
-    last_dash = False
-    for ch in name.strip():
-        if ch.isalnum():
-            clean.append(ch.lower())
-            last_dash = False
-        elif ch in " _-":
-            if not last_dash:
-                clean.append("-")
-                last_dash = True
-        # ignore everything else
-    s = "".join(clean).strip("-")
+    s = _SLUG_SEP.sub("-", _SLUG_DROP.sub("", name.strip())).strip("-").lower()
     return s or "my-web-app"
 
 
+_YES = frozenset(("y", "yes"))
+_NO = frozenset(("n", "no"))
+
+
 def _yes_no(prompt: str, default: bool = True) -> bool:
-    suffix = "[Y/n]" if default else "[y/N]"
+    question = f"{prompt} {'[Y/n]' if default else '[y/N]'}: "
     while True:
-        ans = input(f"{prompt} {suffix}: ").strip().lower()
+        ans = input(question).strip().lower()
         if not ans:
             return default
-        if ans in ("y", "yes"):
+        if ans in _YES:
             return True
-        if ans in ("n", "no"):
+        if ans in _NO:
             return False
         print("Please answer y or n.")
 
 
 def _choice(prompt: str, options: List[str], default: Optional[str] = None) -> str:
+    # prompt / error text and the lookup set are built once, not per retry
+    valid = frozenset(options)
     opts_disp = "/".join(options)
+    question = f"{prompt} ({opts_disp}) [{default}]: " if default else f"{prompt} ({opts_disp}): "
+    retry = f"Please choose one of: {', '.join(options)}"
     while True:
-        if default:
-            ans = input(f"{prompt} ({opts_disp}) [{default}]: ").strip().lower()
-            if not ans:
-                return default
-        else:
-            ans = input(f"{prompt} ({opts_disp}): ").strip().lower()
-        if ans in options:
+        ans = input(question).strip().lower()
+        if not ans and default:
+            return default
+        if ans in valid:
             return ans
-        print(f"Please choose one of: {', '.join(options)}")
+        print(retry)
 
 
-def _run_cmd(cmd: List[str], cwd: Path, env: Optional[Dict[str, str]] = None) -> bool:
-    """Run a command, show it to the user, return True on success."""
-    print()
-    print(f"[cmd] (cwd={cwd})")
-    print("      " + " ".join(cmd))
+def _run_cmd(cmd: List[Union[str, Path]], cwd: Path, env: Optional[Dict[str, str]] = None, out=print) -> bool:
+    """Run a command, show it to the user, return True on success.
+
+    `out` receives one line at a time; install jobs pass a buffer so
+    concurrent commands don't interleave their output.
+    """
+    out("")
+    out(f"[cmd] (cwd={cwd})")
+    out("      " + " ".join(map(str, cmd)))
     try:
-        proc = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            cwd=str(cwd),
-            env=env or os.environ.copy(),
+            cwd=cwd,
+            env=env,   # None inherits os.environ
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
             text=True,
+            bufsize=1 << 16,
         )
     except FileNotFoundError:
-        print(f"[!] Command not found: {cmd[0]} (is it installed and on PATH?)")
+        out(f"[!] Command not found: {cmd[0]} (is it installed and on PATH?)")
         return False
 
+    # npm/pip logs can run to megabytes; only the tail is ever shown
+    tail = deque(maxlen=_FAIL_TAIL_LINES)
+    with proc:
+        for line in proc.stdout:
+            tail.append(line.rstrip("\n"))
+
     if proc.returncode != 0:
-        print("[!] Command failed with exit code", proc.returncode)
-        print(proc.stdout)
+        out(f"[!] Command failed with exit code {proc.returncode}")
+        for line in tail:
+            out(line)
         return False
 
-    out = proc.stdout or ""
-    if out.strip():
-        lines = out.splitlines()
-        tail = lines[-20:] if len(lines) > 20 else lines
-        for line in tail:
-            print("   ", line)
+    if any(line.strip() for line in tail):
+        for line in list(tail)[-_TAIL_LINES:]:
+            out("    " + line)
     return True
 
 
@@ -136,13 +222,68 @@ class ProjectConfig:
     backend: str    # none / express / flask / fastapi
 
 
+@dataclass
+class InstallJob:
+    """Dependency install deferred until all project files are written."""
+    label: str
+    cwd: Path
+    cmds: List[Union[List[Union[str, Path]], Callable[..., bool]]]   # argv, or step(out) -> ok
+    on_fail: str = ""
+    env: Optional[Dict[str, str]] = None
+    log: List[str] = field(default_factory=list)
+    ok: bool = False
+
+
+def _run_install(job: InstallJob) -> InstallJob:
+    """Run a job's commands in order, stopping at the first failure."""
+    job.ok = True
+    for cmd in job.cmds:
+        if callable(cmd):
+            ok = cmd(out=job.log.append)
+        else:
+            ok = _run_cmd(cmd, job.cwd, job.env, out=job.log.append)
+        if not ok:
+            job.ok = False
+            break
+    return job
+
+
+def _run_installs(jobs: List[InstallJob], max_jobs: int = 2) -> None:
+    """
+    Run install jobs concurrently (client and server installs don't
+    depend on each other), then print each job's output as one block.
+    """
+    if not jobs:
+        return
+    from concurrent.futures import ThreadPoolExecutor  # only needed once webcreate runs
+
+    workers = max(1, min(max_jobs, len(jobs)))
+    print()
+    print(f"Installing dependencies ({len(jobs)} job(s), {workers} at a time; this may take a while)...")
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        done = list(ex.map(_run_install, jobs))
+    for job in done:
+        print()
+        _print_header(f"[{job.label}] " + ("done" if job.ok else "FAILED"))
+        for line in job.log:
+            print(line)
+        if not job.ok and job.on_fail:
+            print(job.on_fail)
+
+
 # ------------------------------------------------------------
 # Frontend generation (no Vite CLI, we write the files ourselves)
 # ------------------------------------------------------------
 
-def _frontend_package_json(cfg: ProjectConfig) -> Dict:
-    base_name = _slugify(cfg.name) + "-client"
-    if cfg.frontend == "vanilla":
+@functools.lru_cache(maxsize=8)
+def _frontend_package_json(frontend: str, name: str) -> str:
+    """client/package.json text; cached since it only depends on its arguments."""
+    return json.dumps(_frontend_package_dict(frontend, name), indent=2)
+
+
+def _frontend_package_dict(frontend: str, name: str) -> Dict:
+    base_name = _slugify(name) + "-client"
+    if frontend == "vanilla":
         return {
             "name": base_name,
             "version": "0.0.0",
@@ -156,7 +297,7 @@ def _frontend_package_json(cfg: ProjectConfig) -> Dict:
                 "vite": "^5.4.0",
             },
         }
-    if cfg.frontend == "react":
+    if frontend == "react":
         return {
             "name": base_name,
             "version": "0.0.0",
@@ -175,7 +316,7 @@ def _frontend_package_json(cfg: ProjectConfig) -> Dict:
                 "@vitejs/plugin-react-swc": "^3.5.0",
             },
         }
-    if cfg.frontend == "vue":
+    if frontend == "vue":
         return {
             "name": base_name,
             "version": "0.0.0",
@@ -193,9 +334,9 @@ def _frontend_package_json(cfg: ProjectConfig) -> Dict:
                 "@vitejs/plugin-vue": "^5.0.0",
             },
         }
-    elif cfg.frontend == "svelte":
+    elif frontend == "svelte":
         return {
-            "name": f"{cfg.name}-client",
+            "name": f"{name}-client",
             "version": "0.0.0",
             "private": True,
             "scripts": {
@@ -209,64 +350,48 @@ def _frontend_package_json(cfg: ProjectConfig) -> Dict:
                 "vite": "^6.0.0"
             }
         }
-    raise ValueError(f"Unsupported frontend: {cfg.frontend}")
-
-
-def _write_frontend_files(cfg: ProjectConfig, client_dir: Path) -> None:
-    src = client_dir / "src"
-    src.mkdir(parents=True, exist_ok=True)
-
-    index_html = client_dir / "index.html"
-
-    # --- vanilla -------------------------------------------------
-    if cfg.frontend == "vanilla":
-        main_file = src / "main.js"
-        index_html.write_text(
-            "<!doctype html>\n"
-            "<html>\n"
-            "  <head>\n"
-            "    <meta charset='utf-8' />\n"
-            f"    <title>{cfg.name}</title>\n"
-            "  </head>\n"
-            "  <body>\n"
-            "    <div id='app'></div>\n"
-            "    <script type='module' src='/src/main.js'></script>\n"
-            "  </body>\n"
-            "</html>\n",
-            encoding="utf-8",
-        )
-        main_file.write_text(
+    raise ValueError(f"Unsupported frontend: {frontend}")
+
+
+# Shared by every framework; {mount} and {entry} come from _FRONTEND_ENTRY.
+_INDEX_HTML = (
+    "<!doctype html>\n"
+    "<html>\n"
+    "  <head>\n"
+    "    <meta charset='utf-8' />\n"
+    "    <title>{name}</title>\n"
+    "  </head>\n"
+    "  <body>\n"
+    "    <div id='{mount}'></div>\n"
+    "    <script type='module' src='/src/{entry}'></script>\n"
+    "  </body>\n"
+    "</html>\n"
+)
+
+# framework -> (mount element id, entry script under src/)
+_FRONTEND_ENTRY = {
+    "vanilla": ("app", "main.js"),
+    "react": ("root", "main.jsx"),
+    "vue": ("app", "main.js"),
+    "svelte": ("app", "main.js"),
+}
+
+# framework -> {path relative to client/: content}
+_FRONTEND_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "vanilla": {
+        "src/main.js": (
             "document.querySelector('#app').innerHTML = `\n"
             "  <h1>Hello from CMC vanilla template</h1>\n"
             "  <p>Edit src/main.js to get started.</p>\n"
-            "`;\n",
-            encoding="utf-8",
-        )
-        (client_dir / "vite.config.mjs").write_text(
+            "`;\n"
+        ),
+        "vite.config.mjs": (
             "import { defineConfig } from 'vite'\n"
-            "export default defineConfig({})\n",
-            encoding="utf-8",
-        )
-        return
-
-    # --- React ---------------------------------------------------
-    if cfg.frontend == "react":
-        main_file = src / "main.jsx"
-        index_html.write_text(
-            "<!doctype html>\n"
-            "<html>\n"
-            "  <head>\n"
-            "    <meta charset='utf-8' />\n"
-            f"    <title>{cfg.name}</title>\n"
-            "  </head>\n"
-            "  <body>\n"
-            "    <div id='root'></div>\n"
-            "    <script type='module' src='/src/main.jsx'></script>\n"
-            "  </body>\n"
-            "</html>\n",
-            encoding="utf-8",
-        )
-        main_file.write_text(
+            "export default defineConfig({})\n"
+        ),
+    },
+    "react": {
+        "src/main.jsx": (
             "import React from 'react'\n"
             "import ReactDOM from 'react-dom/client'\n"
             "\n"
@@ -283,46 +408,25 @@ def _write_frontend_files(cfg: ProjectConfig, client_dir: Path) -> None:
             "  <React.StrictMode>\n"
             "    <App />\n"
             "  </React.StrictMode>,\n"
-            ")\n",
-            encoding="utf-8",
-        )
-        (client_dir / "vite.config.mjs").write_text(
+            ")\n"
+        ),
+        "vite.config.mjs": (
             "import { defineConfig } from 'vite'\n"
             "import react from '@vitejs/plugin-react-swc'\n"
             "\n"
             "export default defineConfig({\n"
             "  plugins: [react()],\n"
-            "})\n",
-            encoding="utf-8",
-        )
-        return
-
-    # --- Vue -----------------------------------------------------
-    if cfg.frontend == "vue":
-        main_file = src / "main.js"
-        app_vue = src / "App.vue"
-        index_html.write_text(
-            "<!doctype html>\n"
-            "<html>\n"
-            "  <head>\n"
-            "    <meta charset='utf-8' />\n"
-            f"    <title>{cfg.name}</title>\n"
-            "  </head>\n"
-            "  <body>\n"
-            "    <div id='app'></div>\n"
-            "    <script type='module' src='/src/main.js'></script>\n"
-            "  </body>\n"
-            "</html>\n",
-            encoding="utf-8",
-        )
-        main_file.write_text(
+            "})\n"
+        ),
+    },
+    "vue": {
+        "src/main.js": (
             "import { createApp } from 'vue'\n"
             "import App from './App.vue'\n"
             "\n"
-            "createApp(App).mount('#app')\n",
-            encoding="utf-8",
-        )
-        app_vue.write_text(
+            "createApp(App).mount('#app')\n"
+        ),
+        "src/App.vue": (
             "<template>\n"
             "  <main style=\"padding: 2rem; font-family: system-ui\">\n"
             "    <h1>CMC Vue template</h1>\n"
@@ -332,160 +436,193 @@ def _write_frontend_files(cfg: ProjectConfig, client_dir: Path) -> None:
             "\n"
             "<script setup>\n"
             "// minimal setup\n"
-            "</script>\n",
-            encoding="utf-8",
-        )
-        (client_dir / "vite.config.mjs").write_text(
+            "</script>\n"
+        ),
+        "vite.config.mjs": (
             "import { defineConfig } from 'vite'\n"
             "import vue from '@vitejs/plugin-vue'\n"
             "\n"
             "export default defineConfig({\n"
             "  plugins: [vue()],\n"
-            "})\n",
-            encoding="utf-8",
-        )
-        return
-
-    # --- Svelte --------------------------------------------------
-    if cfg.frontend == "svelte":
-        main_file = src / "main.js"
-        app_svelte = src / "App.svelte"
-        index_html.write_text(
-            "<!doctype html>\n"
-            "<html>\n"
-            "  <head>\n"
-            "    <meta charset='utf-8' />\n"
-            f"    <title>{cfg.name}</title>\n"
-            "  </head>\n"
-            "  <body>\n"
-            "    <div id='app'></div>\n"
-            "    <script type='module' src='/src/main.js'></script>\n"
-            "  </body>\n"
-            "</html>\n",
-            encoding="utf-8",
-        )
-        main_file.write_text(
+            "})\n"
+        ),
+    },
+    "svelte": {
+        "src/main.js": (
             "import App from './App.svelte'\n"
             "\n"
             "const app = new App({\n"
             "  target: document.getElementById('app'),\n"
             "})\n"
             "\n"
-            "export default app\n",
-            encoding="utf-8",
-        )
-        app_svelte.write_text(
+            "export default app\n"
+        ),
+        "src/App.svelte": (
             "<main style='padding: 2rem; font-family: system-ui'>\n"
             "  <h1>CMC Svelte template</h1>\n"
             "  <p>Edit src/App.svelte to get started.</p>\n"
-            "</main>\n",
-            encoding="utf-8",
-        )
-        (client_dir / "vite.config.mjs").write_text(
+            "</main>\n"
+        ),
+        "vite.config.mjs": (
             "import { defineConfig } from 'vite'\n"
             "import { svelte } from '@sveltejs/vite-plugin-svelte'\n"
             "\n"
             "export default defineConfig({\n"
             "  plugins: [svelte()],\n"
-            "})\n",
-            encoding="utf-8",
-        )
-        return
+            "})\n"
+        ),
+    },
+}
 
-    raise ValueError(f"Unsupported frontend: {cfg.frontend}")
 
+def _frontend_files(cfg: ProjectConfig, client_dir: Path) -> Dict[Path, str]:
+    """Starter files for the chosen framework, as {path: content}."""
+    try:
+        templates = _FRONTEND_TEMPLATES[cfg.frontend]
+        mount, entry = _FRONTEND_ENTRY[cfg.frontend]
+    except KeyError:
+        raise ValueError(f"Unsupported frontend: {cfg.frontend}") from None
+
+    files = {client_dir / rel: text for rel, text in templates.items()}
+    files[client_dir / "index.html"] = (
+        _INDEX_HTML.replace("{mount}", mount).replace("{entry}", entry).replace("{name}", cfg.name)
+    )
+    return files
 
-def _generate_frontend(cfg: ProjectConfig) -> None:
+
+def _generate_frontend(cfg: ProjectConfig) -> List[InstallJob]:
     """
     Create the frontend folder, write package.json + starter files,
-    and (when possible) run npm install for you.
+    and return the npm install job for the caller to run.
 
     For Svelte projects we use `npm install --legacy-peer-deps`
     to avoid the current Vite/Svelte peer-dependency conflict.
     """
     if cfg.frontend == "none":
-        return
+        return []
 
     client_dir = cfg.folder / "client"
 
     # Don't overwrite an existing non-empty client folder
-    if client_dir.exists() and any(client_dir.iterdir()):
+    if _dir_nonempty(client_dir):
         print(f"[webcreate] Skipping frontend: {client_dir} already exists and is not empty.")
-        return
-
-    client_dir.mkdir(parents=True, exist_ok=True)
+        return []
 
     print(f"Generating {cfg.frontend} frontend in {client_dir} ...")
 
-    # 1) package.json template based on framework
-    pkg = _frontend_package_json(cfg)
-    (client_dir / "package.json").write_text(
-        json.dumps(pkg, indent=2),
-        encoding="utf-8",
-    )
+    # 1) starter source files (App.vue / main.js / etc.)
+    files = _frontend_files(cfg, client_dir)
 
-    # 2) starter source files (App.vue / main.js / etc.)
-    _write_frontend_files(cfg, client_dir)
+    # 2) package.json template based on framework
+    files[client_dir / "package.json"] = _frontend_package_json(cfg.frontend, cfg.name)
 
     # 3) README for the client
-    (client_dir / "README.md").write_text(
+    files[client_dir / "README.md"] = (
         f"# {cfg.name} – client\n\n"
         "Generated by CMC webcreate.\n\n"
         "## Getting started\n"
         "```bash\n"
         "npm install\n"
         "npm run dev\n"
-        "```\n",
-        encoding="utf-8",
+        "```\n"
     )
 
-    # 4) Try to install dependencies automatically
-    print("Running npm install for frontend (this may take a while)...")
+    _write_files_bulk(files)
 
+    # 4) Queue the dependency install; op_web_create runs it once all files exist
     npm = find_npm()
-    ok = False
-
-    if npm:
-        cmd = [npm, "install"]
-
-        # SVELTE = special case → ignore peer-dependency conflicts
-        if cfg.frontend == "svelte":
-            cmd.append("--legacy-peer-deps")
-
-        ok = _run_cmd(cmd, client_dir)
-    else:
+    if not npm:
         print("[!] npm not found. You can run it manually inside client/:  npm install")
-        ok = False
-
-    if not ok:
-        if cfg.frontend == "svelte":
-            print(
-                "[webcreate] npm install failed or reported dependency conflicts.\n"
-                "           Inside client/, you can try:\n"
-                "             npm install --legacy-peer-deps\n"
-                "           or, if you prefer, just keep the files and adjust deps manually."
-            )
-        else:
-            print(
-                "[webcreate] npm install failed or npm not found. "
-                "You can run it manually later inside client/."
-            )
+        return []
 
+    cmd = [npm, "install", *_NPM_INSTALL_FLAGS]
 
+    # SVELTE = special case → ignore peer-dependency conflicts
+    if cfg.frontend == "svelte":
+        cmd.append("--legacy-peer-deps")
+        on_fail = (
+            "[webcreate] npm install failed or reported dependency conflicts.\n"
+            "           Inside client/, you can try:\n"
+            "             npm install --legacy-peer-deps\n"
+            "           or, if you prefer, just keep the files and adjust deps manually."
+        )
+    else:
+        on_fail = "[webcreate] npm install failed. You can run it manually later inside client/."
 
+    return [InstallJob(f"{cfg.frontend} frontend", client_dir, [cmd], on_fail)]
 
 
 # ------------------------------------------------------------
 # Backend generation
 # ------------------------------------------------------------
 
-def _generate_backend_flask(cfg: ProjectConfig, server_dir: Path) -> None:
-    server_dir.mkdir(parents=True, exist_ok=True)
-    (server_dir / "requirements.txt").write_text(
-        "flask\nflask-cors\n",
-        encoding="utf-8",
+def _make_venv(venv_dir: Path, out=print) -> bool:
+    """
+    Create a venv with pip, in-process (no extra interpreter start-up).
+    pip itself still runs in the venv's own interpreter afterwards, so it
+    installs there rather than into CMC's environment.
+    """
+    out("")
+    out(f"[venv] {venv_dir}")
+    try:
+        import venv
+        venv.EnvBuilder(with_pip=True, symlinks=(os.name != "nt")).create(venv_dir)
+    except Exception as e:
+        out(f"[!] Could not create virtual environment: {e}")
+        return False
+    return True
+
+
+def _venv_pip(venv_dir: Path) -> Path:
+    """
+    pip inside a venv (Scripts\\pip.exe on Windows, bin/pip elsewhere).
+    Absolute, since the command runs with cwd=server/ and a relative
+    executable would be looked up from there.
+    """
+    venv_dir = venv_dir.resolve()
+    if os.name == "nt":
+        return venv_dir / "Scripts" / "pip.exe"
+    return venv_dir / "bin" / "pip"
+
+
+def _venv_install_job(label: str, server_dir: Path) -> InstallJob:
+    """
+    venv creation and dependency install, run back to back in one job.
+    With uv on PATH both steps go through uv (fast resolver, parallel
+    downloads); otherwise EnvBuilder + the venv's own pip.
+    """
+    venv_dir = server_dir / "venv"
+    uv = find_uv()
+    if uv:
+        # Same interpreter as `python -m venv` would use; --seed keeps pip in the venv.
+        # uv installs into whatever VIRTUAL_ENV points at; absolute, as uv
+        # runs with cwd=server/ and would resolve a relative one from there.
+        python = ["--python", sys.executable] if sys.executable else []
+        steps = [
+            [uv, "venv", "--seed", *python, "venv"],
+            [uv, "pip", "install", "-r", "requirements.txt"],
+        ]
+        env = {**os.environ, "VIRTUAL_ENV": str(venv_dir.resolve())}
+    else:
+        steps = [
+            functools.partial(_make_venv, venv_dir),
+            [_venv_pip(venv_dir), "install",
+             "--disable-pip-version-check", "-r", "requirements.txt"],
+        ]
+        env = None
+    return InstallJob(
+        label,
+        server_dir,
+        steps,
+        "[webcreate] venv/pip install failed for the backend. Run it manually in server/ later.",
+        env=env,
     )
-    (server_dir / "app.py").write_text(
+
+
+def _generate_backend_flask(cfg: ProjectConfig, server_dir: Path) -> List[InstallJob]:
+    files: Dict[Path, str] = {}
+    files[server_dir / "requirements.txt"] = "flask\nflask-cors\n"
+    files[server_dir / "app.py"] = (
         "from flask import Flask, jsonify\n"
         "from flask_cors import CORS\n"
         "\n"
@@ -497,35 +634,24 @@ def _generate_backend_flask(cfg: ProjectConfig, server_dir: Path) -> None:
         "    return jsonify({'message': 'Hello from Flask backend'})\n"
         "\n"
         "if __name__ == '__main__':\n"
-        "    app.run(debug=True)\n",
-        encoding="utf-8",
+        "    app.run(debug=True)\n"
     )
-    (server_dir / "start_server.bat").write_text(
+    files[server_dir / "start_server.bat"] = (
         "@echo off\n"
         "cd /d %~dp0\n"
         "call venv\\Scripts\\activate.bat\n"
-        "python app.py\n",
-        encoding="utf-8",
-    )
-    (server_dir / ".gitignore").write_text(
-        "venv/\n__pycache__/\n*.pyc\n",
-        encoding="utf-8",
+        "python app.py\n"
     )
+    files[server_dir / ".gitignore"] = "venv/\n__pycache__/\n*.pyc\n"
+    _write_files_bulk(files)
 
-    print("Creating Python virtual environment for Flask backend...")
-    python_exe = sys.executable or "python"
-    _run_cmd([python_exe, "-m", "venv", "venv"], server_dir)
-    print("Installing backend dependencies with pip...")
-    _run_cmd([str(server_dir / "venv" / "Scripts" / "pip.exe"), "install", "-r", "requirements.txt"], server_dir)
+    return [_venv_install_job("Flask backend", server_dir)]
 
 
-def _generate_backend_fastapi(cfg: ProjectConfig, server_dir: Path) -> None:
-    server_dir.mkdir(parents=True, exist_ok=True)
-    (server_dir / "requirements.txt").write_text(
-        "fastapi\nuvicorn[standard]\n",
-        encoding="utf-8",
-    )
-    (server_dir / "app.py").write_text(
+def _generate_backend_fastapi(cfg: ProjectConfig, server_dir: Path) -> List[InstallJob]:
+    files: Dict[Path, str] = {}
+    files[server_dir / "requirements.txt"] = "fastapi\nuvicorn[standard]\n"
+    files[server_dir / "app.py"] = (
         "from fastapi import FastAPI\n"
         "from fastapi.middleware.cors import CORSMiddleware\n"
         "\n"
@@ -543,31 +669,23 @@ def _generate_backend_fastapi(cfg: ProjectConfig, server_dir: Path) -> None:
         "\n"
         "if __name__ == '__main__':\n"
         "    import uvicorn\n"
-        "    uvicorn.run('app:app', reload=True)\n",
-        encoding="utf-8",
+        "    uvicorn.run('app:app', reload=True)\n"
     )
-    (server_dir / "start_server.bat").write_text(
+    files[server_dir / "start_server.bat"] = (
         "@echo off\n"
         "cd /d %~dp0\n"
         "call venv\\Scripts\\activate.bat\n"
-        "python app.py\n",
-        encoding="utf-8",
-    )
-    (server_dir / ".gitignore").write_text(
-        "venv/\n__pycache__/\n*.pyc\n",
-        encoding="utf-8",
+        "python app.py\n"
     )
+    files[server_dir / ".gitignore"] = "venv/\n__pycache__/\n*.pyc\n"
+    _write_files_bulk(files)
 
-    print("Creating Python virtual environment for FastAPI backend...")
-    python_exe = sys.executable or "python"
-    _run_cmd([python_exe, "-m", "venv", "venv"], server_dir)
-    print("Installing backend dependencies with pip...")
-    _run_cmd([str(server_dir / "venv" / "Scripts" / "pip.exe"), "install", "-r", "requirements.txt"], server_dir)
+    return [_venv_install_job("FastAPI backend", server_dir)]
 
 
-def _generate_backend_express(cfg: ProjectConfig, server_dir: Path) -> None:
-    server_dir.mkdir(parents=True, exist_ok=True)
-    (server_dir / "server.js").write_text(
+def _generate_backend_express(cfg: ProjectConfig, server_dir: Path) -> List[InstallJob]:
+    files: Dict[Path, str] = {}
+    files[server_dir / "server.js"] = (
         "const express = require('express');\n"
         "const cors = require('cors');\n"
         "\n"
@@ -582,60 +700,61 @@ def _generate_backend_express(cfg: ProjectConfig, server_dir: Path) -> None:
         "\n"
         "app.listen(port, () => {\n"
         "  console.log(`Server listening on http://localhost:${port}`);\n"
-        "});\n",
-        encoding="utf-8",
+        "});\n"
     )
-    (server_dir / "package.json").write_text(
-        json.dumps(
-            {
-                "name": _slugify(cfg.name) + "-server",
-                "version": "0.0.0",
-                "private": True,
-                "scripts": {
-                    "start": "node server.js"
-                },
-                "dependencies": {
-                    "express": "^4.19.0",
-                    "cors": "^2.8.5"
-                }
+    files[server_dir / "package.json"] = json.dumps(
+        {
+            "name": _slugify(cfg.name) + "-server",
+            "version": "0.0.0",
+            "private": True,
+            "scripts": {
+                "start": "node server.js"
             },
-            indent=2,
-        ),
-        encoding="utf-8",
-    )
-    (server_dir / ".gitignore").write_text(
-        "node_modules/\n",
-        encoding="utf-8",
+            "dependencies": {
+                "express": "^4.19.0",
+                "cors": "^2.8.5"
+            }
+        },
+        indent=2,
     )
-    (server_dir / "start_server.bat").write_text(
+    files[server_dir / ".gitignore"] = "node_modules/\n"
+    files[server_dir / "start_server.bat"] = (
         "@echo off\n"
         "cd /d %~dp0\n"
-        "npm start\n",
-        encoding="utf-8",
+        "npm start\n"
     )
+    _write_files_bulk(files)
+
+    npm = find_npm()
+    if not npm:
+        print("[!] npm not found. You can run it manually inside server/:  npm install")
+        return []
 
-    print("Installing Express backend dependencies with npm...")
-    ok = _run_cmd(["npm", "install"], server_dir)
-    if not ok:
-        print("[webcreate] npm install failed for Express backend. Run it manually in server/ later.")
+    return [InstallJob(
+        "Express backend",
+        server_dir,
+        [[npm, "install", *_NPM_INSTALL_FLAGS]],
+        "[webcreate] npm install failed for Express backend. Run it manually in server/ later.",
+    )]
 
 
-def _generate_backend(cfg: ProjectConfig) -> None:
+def _generate_backend(cfg: ProjectConfig) -> List[InstallJob]:
     if cfg.backend == "none":
-        return
+        return []
 
     server_dir = cfg.folder / "server"
 
-    if server_dir.exists() and any(server_dir.iterdir()):
+    if _dir_nonempty(server_dir):
         print(f"[webcreate] Skipping backend: {server_dir} already exists and is not empty.")
-        return
+        return []
 
+    print(f"Generating {cfg.backend} backend in {server_dir} ...")
     if cfg.backend == "flask":
-        _generate_backend_flask(cfg, server_dir)
+        return _generate_backend_flask(cfg, server_dir)
     elif cfg.backend == "fastapi":
-        _generate_backend_fastapi(cfg, server_dir)
+        return _generate_backend_fastapi(cfg, server_dir)
     elif cfg.backend == "express":
-        _generate_backend_express(cfg, server_dir)
+        return _generate_backend_express(cfg, server_dir)
     else:
         raise ValueError(f"Unsupported backend: {cfg.backend}")
 
@@ -677,8 +796,13 @@ def _write_launcher(cfg: ProjectConfig) -> None:
     launcher_path.write_text("\n".join(lines), encoding="utf-8")
 
 
-def op_web_create() -> None:
-    """Interactive entry point for CMC."""
+def op_web_create(jobs: Optional[int] = None) -> None:
+    """
+    Interactive entry point for CMC.
+
+    `jobs` caps how many dependency installs run at once
+    (default: CMC_WEB_JOBS or 2).
+    """
     _print_header("CMC Web Create Wizard")
 
     # 1) Basic questions
@@ -724,16 +848,17 @@ def op_web_create() -> None:
     # 2) Create base folder
     cfg.folder.mkdir(parents=True, exist_ok=True)
 
-    # 3) Generate parts
+    # 3) Generate parts (files only; installs are collected)
+    installs: List[InstallJob] = []
     if cfg.frontend != "none":
-        _generate_frontend(cfg)
+        installs += _generate_frontend(cfg)
     if cfg.backend != "none":
-        _generate_backend(cfg)
+        installs += _generate_backend(cfg)
         
     # 4) Launcher (always created)
     _write_launcher(cfg)
 
-    # 4) Root README
+    # 5) Root README
     (cfg.folder / "README.md").write_text(
         f"# {cfg.name}\n\n"
         "Generated by CMC webcreate.\n\n"
@@ -745,6 +870,14 @@ def op_web_create() -> None:
         encoding="utf-8",
     )
 
+    # 6) npm / pip installs, side by side
+    if jobs is None:
+        try:
+            jobs = int(os.environ.get("CMC_WEB_JOBS", "2"))
+        except ValueError:
+            jobs = 2
+    _run_installs(installs, jobs)
+
     print()
     print("-" * 60)
     print("Done!")
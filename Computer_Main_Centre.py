@@ -645,6 +645,9 @@ def op_home():
 def op_list(path=None, depth=1, only=None, pattern=None):
     root = resolve(path) if path else CWD
     rows = []
+    # Compile the glob once; fnmatch.fnmatch would re-normalize and hit its cache per name.
+    # (IGNORECASE on Windows mirrors fnmatch's os.path.normcase behaviour.)
+    match = re.compile(fnmatch.translate(pattern), re.IGNORECASE if os.name == "nt" else 0).match if pattern else None
     try:
         for base, dirs, files in os.walk(root):
             lvl = Path(base).relative_to(root).parts
@@ -652,12 +655,12 @@ def op_list(path=None, depth=1, only=None, pattern=None):
             if only in (None, "dirs"):
                 for d in dirs:
                     full = str(Path(base)/d)
-                    if pattern and not fnmatch.fnmatch(d, pattern): continue
+                    if match and not match(d): continue
                     rows.append((full, "dir"))
             if only in (None, "files"):
                 for f in files:
                     full = str(Path(base)/f)
-                    if pattern and not fnmatch.fnmatch(f, pattern): continue
+                    if match and not match(f): continue
                     rows.append((full, "file"))
         if RICH:
             t = Table(title=f"Listing: {root}")
@@ -1047,9 +1050,26 @@ def op_biggest(path=None):
     for f in files:
         p(f"  {f.stat().st_size/1024/1024:6.1f} MB  {f}")
 
+# Folders a name search never descends into: huge, system-owned or generated.
+# They can still match by name themselves; only their contents are skipped.
+_FIND_PRUNE_DIRS = frozenset({
+    "windows", "appdata", "$recycle.bin", "system volume information",
+    "node_modules", ".git", "__pycache__",
+})
+
 def op_find_name(name):
     base = Path.cwd()
-    results = [str(fp) for fp in base.rglob("*") if name.lower() in fp.name.lower()]
+    needle = name.lower()
+    results = []
+    for dirpath, dirnames, filenames in os.walk(base):
+        for n in dirnames:
+            if needle in n.lower():
+                results.append(os.path.join(dirpath, n))
+        for n in filenames:
+            if needle in n.lower():
+                results.append(os.path.join(dirpath, n))
+        # prune in place so os.walk never lists those subtrees
+        dirnames[:] = [d for d in dirnames if d.lower() not in _FIND_PRUNE_DIRS]
     if results:
         p(f"[cyan]🔎 Found {len(results)} match(es):[/cyan]")
         for r in results[:20]:
@@ -1111,6 +1131,22 @@ def op_run(path):
                 p(f"[red]❌ {e}[/red]" if RICH else f"Error: {e}")
                 
                 
+def _scan_files_dirs(base: Path):
+    """
+    One os.scandir pass over `base` -> (files, dirs) as Paths.
+    DirEntry knows its type from the listing, so this replaces two iterdir()
+    passes plus an is_file()/is_dir() stat per entry.
+    """
+    files, dirs = [], []
+    with os.scandir(base) as it:
+        for entry in it:
+            if entry.is_file():
+                files.append(base / entry.name)
+            elif entry.is_dir():
+                dirs.append(base / entry.name)
+    return files, dirs
+
+
 # ---------- Project Setup Wizard (Enhanced Web + fullstack support) ----------
 def op_project_setup():
     """
@@ -1226,8 +1262,7 @@ def op_project_setup():
 
     # Reuse existing detection helper if available, else gather files/dirs
     try:
-        files = [f for f in base.iterdir() if f.is_file()]
-        dirs = [d for d in base.iterdir() if d.is_dir()]
+        files, dirs = _scan_files_dirs(base)
     except Exception as e:
         p(f"[red]❌ Cannot access folder for setup:[/red] {e}")
         return
@@ -1625,8 +1660,7 @@ def op_web_setup():
     base = CWD
 
     try:
-        files = [f for f in base.iterdir() if f.is_file()]
-        dirs = [d for d in base.iterdir() if d.is_dir()]
+        files, dirs = _scan_files_dirs(base)
     except Exception as e:
         p(f"[red]❌ Cannot scan folder for websetup:[/red] {e}")
         return
@@ -2077,8 +2111,7 @@ def _detect_project_for_setup(base: Path):
         }
     """
     try:
-        files = [f for f in base.iterdir() if f.is_file()]
-        dirs = [d for d in base.iterdir() if d.is_dir()]
+        files, dirs = _scan_files_dirs(base)
     except Exception:
         files, dirs = [], []
 
@@ -2184,7 +2217,7 @@ def op_project_setup():
 
     # We'll also need the current file list for some actions (e.g. MC start script)
     try:
-        files = [f for f in base.iterdir() if f.is_file()]
+        files, _ = _scan_files_dirs(base)
     except Exception:
         files = []
     file_names = [f.name for f in files]
@@ -3184,13 +3217,14 @@ def handle_command(s: str):
         # ---------- CMC Self Update ----------
     if low in ("cmc update check", "cmc update"):
         try:
-            from CMC_Update import cmc_update_check, cmc_update_apply
+            from CMC_Update import cmc_update_check, cmc_update_apply_bg
             if low == "cmc update check":
                 cmc_update_check(p)
             else:
-                # Update the folder where Computer_Main_Centre.py lives
+                # Update the folder where Computer_Main_Centre.py lives, on a
+                # worker thread so the prompt stays usable meanwhile
                 here = Path(__file__).resolve().parent
-                cmc_update_apply(p, here)
+                cmc_update_apply_bg(p, here)
         except Exception as e:
             p(f"[red]❌ CMC update failed:[/red] {e}" if RICH else f"CMC update failed: {e}")
         return
@@ -4145,10 +4179,11 @@ You usually do NOT need normal git commands.
   Commit and push ONLY the specified file/folder (partial commit).
   Other changes are ignored.
 
-• git download <owner>/<repo>
+• git download <owner>/<repo> [full]
   Download (clone) any GitHub repository into the current CMC folder.
   Works with public repos and private repos you have access to.
   Simplified alternative to git clone.
+  Fetches only the latest snapshot; add "full" to get the whole history.
 
 • git link <owner>/<repo>
   Link the current folder to an existing GitHub repository.